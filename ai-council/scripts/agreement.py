@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Local agreement scoring across AI Council responses.
+
+Splits each model's answer into claims (sentences / bullets), embeds them as
+TF-IDF vectors and uses one matrix product per question to find which claims
+other models back up. Produces a compact summary the agent can read instead
+of every full response.
+
+Usage:
+    python council.py "question" | python agreement.py
+    python agreement.py batch.jsonl [--threshold 0.35] [--claims 5]
+
+Requirements:
+    pip install numpy
+"""
+
+import json
+import re
+import sys
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError as e:
+    if __name__ == "__main__":
+        print("ERROR: numpy not installed. Run: pip install numpy", file=sys.stderr)
+        sys.exit(1)
+    # council.py imports this after paid queries have returned; let it keep their answers
+    raise ImportError("numpy not installed. Run: pip install numpy") from e
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:['.-][a-z0-9]+)*")
+CLAIM_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)]|#+)\s*")
+MIN_CLAIM_TOKENS = 4
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could
+do does for from has have how i if in into is it its just more most not of on
+one or other our so some such than that the their them then there these they
+this to too very was we were what when which while who will with would you your
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def split_claims(text: str) -> list[str]:
+    """Break a response into sentence/bullet-sized claims, dropping fragments."""
+    claims = []
+    for part in CLAIM_SPLIT_RE.split(text):
+        part = BULLET_RE.sub("", part).strip().strip("*_")
+        if len(tokenize(part)) >= MIN_CLAIM_TOKENS:
+            claims.append(part)
+    return claims
+
+
+def tfidf_matrix(docs: list[list[str]]) -> np.ndarray:
+    """Row-normalised sublinear TF-IDF matrix for tokenised documents."""
+    vocab: dict[str, int] = {}
+    rows, cols, counts = [], [], []
+    for i, tokens in enumerate(docs):
+        for term, count in Counter(tokens).items():
+            rows.append(i)
+            cols.append(vocab.setdefault(term, len(vocab)))
+            counts.append(count)
+
+    matrix = np.zeros((len(docs), max(len(vocab), 1)), dtype=np.float32)
+    if not vocab:
+        return matrix
+    matrix[rows, cols] = 1.0 + np.log(np.asarray(counts, dtype=np.float32))
+    df = np.count_nonzero(matrix, axis=0)
+    matrix *= np.log((1 + len(docs)) / (1 + df)) + 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _normalize(responses) -> tuple[list[tuple[str, str]], list[str]]:
+    """Accept ModelResponse objects or council.py JSON dicts; split off failures."""
+    answered, failed = [], []
+    for r in responses:
+        model = r["model"] if isinstance(r, dict) else r.model
+        success = r["success"] if isinstance(r, dict) else r.success
+        text = (r.get("response") if isinstance(r, dict) else r.response) or ""
+        if success and text.strip():
+            answered.append((model, text))
+        else:
+            failed.append(model)
+    return answered, failed
+
+
+def score_agreement(responses, threshold: float = 0.35, max_claims: int = 5) -> dict:
+    """
+    Score pairwise agreement between model responses to one question.
+
+    Returns a dict with:
+      pairwise   - symmetric claim coverage per model pair (0..1)
+      agreement  - mean of the pairwise scores
+      shared     - claims backed by 2+ models, best supported first
+      divergent  - per model, the most distinctive claims no other model backs
+      failed     - models with no usable response
+    """
+    answered, failed = _normalize(responses)
+    models = [m for m, _ in answered]
+    summary = {"models": models, "pairwise": {}, "agreement": None,
+               "shared": [], "divergent": {}, "failed": failed}
+    if not answered:
+        return summary
+
+    claims, owners = [], []
+    for idx, (_, text) in enumerate(answered):
+        for claim in split_claims(text):
+            claims.append(claim)
+            owners.append(idx)
+    if not claims:
+        return summary
+
+    vectors = tfidf_matrix([tokenize(c) for c in claims])
+    owners_arr = np.asarray(owners)
+    sim = vectors @ vectors.T
+
+    # best[i, m] = strongest match for claim i among model m's claims
+    best = np.zeros((len(claims), len(models)), dtype=np.float32)
+    for m in range(len(models)):
+        mask = owners_arr == m
+        if mask.any():
+            best[:, m] = sim[:, mask].max(axis=1)
+    best[np.arange(len(claims)), owners_arr] = 0.0
+    supported = best >= threshold
+
+    for a in range(len(models)):
+        for b in range(a + 1, len(models)):
+            a_claims, b_claims = owners_arr == a, owners_arr == b
+            cover_ab = supported[a_claims, b].mean() if a_claims.any() else 0.0
+            cover_ba = supported[b_claims, a].mean() if b_claims.any() else 0.0
+            summary["pairwise"][f"{models[a]}~{models[b]}"] = round(float(cover_ab + cover_ba) / 2, 3)
+    if summary["pairwise"]:
+        summary["agreement"] = round(sum(summary["pairwise"].values()) / len(summary["pairwise"]), 3)
+
+    # Shared: greedily keep the best-supported claims, skipping near-duplicates
+    support_counts = supported.sum(axis=1)
+    order = sorted(np.nonzero(support_counts)[0], key=lambda i: (-support_counts[i], -best[i].max()))
+    picked: list[int] = []
+    for i in order:
+        if any(sim[i, j] >= threshold for j in picked):
+            continue
+        picked.append(i)
+        backers = [models[owners[i]]] + [models[m] for m in np.nonzero(supported[i])[0]]
+        summary["shared"].append({"claim": claims[i], "models": backers,
+                                  "similarity": round(float(best[i].max()), 3)})
+        if len(summary["shared"]) >= max_claims:
+            break
+
+    # Divergent: unsupported claims, most distinctive (highest TF-IDF mass) first
+    salience = vectors.sum(axis=1)
+    for m, model in enumerate(models):
+        lonely = [i for i in np.nonzero((owners_arr == m) & (support_counts == 0))[0]]
+        lonely.sort(key=lambda i: -salience[i])
+        if lonely:
+            summary["divergent"][model] = [claims[i] for i in lonely[:max_claims]]
+
+    return summary
+
+
+def _read_records(path: str) -> list[dict]:
+    """Read a council.py JSON object, or JSONL from --batch/--daemon."""
+    text = sys.stdin.read() if path == "-" else open(path, encoding="utf-8").read()
+    text = text.strip()
+    try:
+        data = json.loads(text)
+        return data if isinstance(data, list) else [data]
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main():
+    args = sys.argv[1:]
+    path = args[0] if args and not args[0].startswith("--") else "-"
+    threshold = float(args[args.index("--threshold") + 1]) if "--threshold" in args else 0.35
+    max_claims = int(args[args.index("--claims") + 1]) if "--claims" in args else 5
+
+    records = _read_records(path)
+    for record in records:
+        summary = score_agreement(record["responses"], threshold, max_claims)
+        output = {"question": record.get("question"), "agreement": summary}
+        print(json.dumps(output, indent=2 if len(records) == 1 else None))
+
+
+if __name__ == "__main__":
+    main()
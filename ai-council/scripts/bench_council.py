@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Offline latency/throughput benchmark for council.py's orchestration layer.
+
+Puts fake `codex` and `gemini` executables (backed by fake_cli.py) first on
+PATH, then drives council.py in three modes:
+  single  - one cold query_all() per question, back to back
+  batch   - all questions through a WorkerPool with --jobs in flight
+  stream  - questions piped line by line into `council.py --daemon`
+
+Latency is split into the simulated model delay, CLI startup and
+orchestration. Startup is the configured --startup for questions answered by
+a freshly spawned CLI (the stub's simulated cost, not council.py's) and zero
+for warm ones. Orchestration is what remains: pipes, scheduling and any
+startup the pool failed to hide, i.e. the cost council.py adds.
+
+Usage:
+    python bench_council.py [--questions 20] [--delay 0.2] [--startup 0.5]
+                            [--output-bytes 4000] [--fail-rate 0.05]
+                            [--noise-lines 3] [--jobs 4] [--modes single,batch,stream]
+                            [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import council
+
+
+def install_fake_clis(bin_dir: Path):
+    """Write codex/gemini shims that exec fake_cli.py and prepend them to PATH."""
+    fake = SCRIPT_DIR / "fake_cli.py"
+    for name in ("codex", "gemini"):
+        if os.name == "nt":
+            (bin_dir / f"{name}.cmd").write_text(f'@"{sys.executable}" "{fake}" %*\r\n')
+        else:
+            shim = bin_dir / name
+            shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{fake}" "$@"\n')
+            shim.chmod(shim.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    os.environ["PATH"] = str(bin_dir) + os.pathsep + os.environ["PATH"]
+    os.environ.pop("COUNCIL_CODEX_BIN", None)
+    os.environ.pop("COUNCIL_GEMINI_BIN", None)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarize(mode: str, latencies: list[float], colds: list[bool], wall: float, failures: int,
+              delay: float, startup: float) -> dict:
+    orchestration = [max(0.0, l - delay - (startup if cold else 0.0)) for l, cold in zip(latencies, colds)]
+    return {
+        "mode": mode,
+        "questions": len(latencies),
+        "failures": failures,
+        "cold": sum(colds),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "orchestration_p50": percentile(orchestration, 50),
+        "orchestration_p95": percentile(orchestration, 95),
+        "throughput_qps": len(latencies) / wall if wall else 0.0,
+        "wall": wall,
+    }
+
+
+def count_failures(responses: list[council.ModelResponse]) -> int:
+    return sum(1 for r in responses if not r.success)
+
+
+def any_cold(responses: list[council.ModelResponse]) -> bool:
+    """A question waits for its slowest CLI, so one cold start puts startup in its latency."""
+    return any(not r.warm for r in responses)
+
+
+async def bench_single(questions: list[str]) -> tuple[list[float], list[bool], float, int]:
+    latencies, colds, failures = [], [], 0
+    wall_start = time.perf_counter()
+    for q in questions:
+        start = time.perf_counter()
+        responses = await council.query_all(q)
+        latencies.append(time.perf_counter() - start)
+        colds.append(any_cold(responses))
+        failures += count_failures(responses)
+    return latencies, colds, time.perf_counter() - wall_start, failures
+
+
+async def bench_batch(questions: list[str], jobs: int) -> tuple[list[float], list[bool], float, int]:
+    latencies, colds, failures = [], [], 0
+    semaphore = asyncio.Semaphore(jobs)
+    async with council.WorkerPool([council.codex_spec(), council.gemini_spec()], size=jobs + 1) as pool:
+
+        async def one(q: str, cold: bool = False):
+            nonlocal failures
+            async with semaphore:
+                start = time.perf_counter()
+                responses = await pool.query_all(q, cold)
+                latencies.append(time.perf_counter() - start)
+                colds.append(any_cold(responses))
+                failures += count_failures(responses)
+
+        # Same order as council.run_batch: a cold baseline first, then the warm questions
+        # once the parked processes have had a full cold start's time to boot
+        wall_start = time.perf_counter()
+        if questions:
+            await one(questions[0], cold=True)
+        await asyncio.gather(*(one(q) for q in questions[1:]))
+        wall = time.perf_counter() - wall_start
+    return latencies, colds, wall, failures
+
+
+async def bench_stream(questions: list[str]) -> tuple[list[float], list[bool], float, int]:
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, str(SCRIPT_DIR / "council.py"), "--daemon",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    latencies, colds, failures = [], [], 0
+    wall_start = time.perf_counter()
+    for q in questions:
+        start = time.perf_counter()
+        proc.stdin.write(q.encode() + b"\n")
+        await proc.stdin.drain()
+        line = await proc.stdout.readline()
+        latencies.append(time.perf_counter() - start)
+        responses = json.loads(line)["responses"]
+        colds.append(any(not r["warm"] for r in responses))
+        failures += sum(1 for r in responses if not r["success"])
+    wall = time.perf_counter() - wall_start
+    proc.stdin.close()
+    await proc.wait()
+    return latencies, colds, wall, failures
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark council.py against fake model CLIs")
+    parser.add_argument("--questions", type=int, default=20, help="Questions per mode")
+    parser.add_argument("--delay", type=float, default=0.2, help="Simulated model seconds per question")
+    parser.add_argument("--startup", type=float, default=0.5, help="Simulated CLI startup seconds")
+    parser.add_argument("--output-bytes", type=int, default=2000, help="Approximate answer size")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Probability a CLI call fails")
+    parser.add_argument("--noise-lines", type=int, default=2, help="Log lines each CLI prints")
+    parser.add_argument("--jobs", type=int, default=4, help="Questions in flight for batch mode")
+    parser.add_argument("--modes", default="single,batch,stream", help="Comma-separated modes to run")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    os.environ.update({
+        "FAKE_CLI_STARTUP": str(args.startup),
+        "FAKE_CLI_DELAY": str(args.delay),
+        "FAKE_CLI_OUTPUT_BYTES": str(args.output_bytes),
+        "FAKE_CLI_FAIL_RATE": str(args.fail_rate),
+        "FAKE_CLI_NOISE_LINES": str(args.noise_lines),
+    })
+    questions = [f"Benchmark question {i}?" for i in range(args.questions)]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="council-bench-") as tmp:
+        install_fake_clis(Path(tmp))
+        for mode in args.modes.split(","):
+            print(f"[INFO] Running {mode} mode ({len(questions)} questions)...", file=sys.stderr)
+            if mode == "single":
+                latencies, colds, wall, failures = await bench_single(questions)
+            elif mode == "batch":
+                latencies, colds, wall, failures = await bench_batch(questions, args.jobs)
+            elif mode == "stream":
+                latencies, colds, wall, failures = await bench_stream(questions)
+            else:
+                print(f"[WARN] Unknown mode: {mode}", file=sys.stderr)
+                continue
+            results.append(summarize(mode, latencies, colds, wall, failures, args.delay, args.startup))
+
+    if args.json:
+        print(json.dumps({"config": vars(args), "results": results}, indent=2))
+        return
+
+    print(f"\nstartup={args.startup}s delay={args.delay}s output={args.output_bytes}B "
+          f"fail_rate={args.fail_rate} noise={args.noise_lines} jobs={args.jobs}")
+    print(f"{'mode':<8}{'p50':>8}{'p95':>8}{'p99':>8}{'cold':>6}{'orch p50':>10}{'orch p95':>10}{'q/s':>8}{'fail':>6}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['p50']:>8.3f}{r['p95']:>8.3f}{r['p99']:>8.3f}{r['cold']:>6}"
+              f"{r['orchestration_p50']:>10.3f}{r['orchestration_p95']:>10.3f}{r['throughput_qps']:>8.2f}"
+              f"{r['failures']:>6}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,12 +11,18 @@ import io
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
+import argparse
 import asyncio
-import subprocess
 import json
+import os
+import shlex
+import shutil
+import time
 from dataclasses import dataclass
 from typing import Optional
 
+TIMEOUT = 120
+
 
 @dataclass
 class ModelResponse:
@@ -24,55 +30,178 @@ class ModelResponse:
     response: str
     success: bool
     error: Optional[str] = None
+    latency: Optional[float] = None
+    warm: bool = False
 
 
-async def query_codex(question: str, model: str = "gpt-5.2") -> ModelResponse:
-    """Query ChatGPT via Codex CLI."""
+@dataclass
+class CliSpec:
+    """How to launch one model CLI. The question is always fed on stdin."""
+    model: str
+    argv: list[str]
+    skip_prefixes: tuple[str, ...] = ()
+
+    def clean(self, stdout: bytes) -> str:
+        lines = stdout.decode().strip().split('\n')
+        return '\n'.join(l for l in lines if not l.startswith(self.skip_prefixes)).strip()
+
+
+def _cli_argv(env_var: str, default: list[str]) -> list[str]:
+    """Allow COUNCIL_CODEX_BIN / COUNCIL_GEMINI_BIN to swap in a stub CLI."""
+    override = os.environ.get(env_var)
+    if override:
+        return shlex.split(override, posix=os.name != 'nt')
+    return default
+
+
+def codex_spec(model: str = "gpt-5.2") -> CliSpec:
+    # `codex exec -` reads the prompt from stdin
+    return CliSpec("ChatGPT", _cli_argv("COUNCIL_CODEX_BIN", ["codex"]) + ["exec", "-m", model, "-"])
+
+
+def gemini_spec(model: str = "gemini-3-pro-preview") -> CliSpec:
+    # Gemini CLI runs non-interactively on piped stdin
+    return CliSpec(
+        "Gemini",
+        _cli_argv("COUNCIL_GEMINI_BIN", ["gemini"]) + ["-m", model, "-o", "text"],
+        skip_prefixes=('Loaded cached', 'Hook registry'),
+    )
+
+
+async def spawn(spec: CliSpec) -> asyncio.subprocess.Process:
+    """Start a CLI process that blocks on stdin until it is given a question."""
+    # Resolve through PATH(EXT) so npm .cmd shims work on Windows without a shell
+    exe = shutil.which(spec.argv[0]) or spec.argv[0]
+    return await asyncio.create_subprocess_exec(
+        exe, *spec.argv[1:],
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+
+async def ask(spec: CliSpec, question: str, proc: Optional[asyncio.subprocess.Process] = None) -> ModelResponse:
+    """Send a question to a CLI process, spawning a cold one if none is given."""
+    warm = proc is not None
+    started = time.perf_counter()
     try:
-        # Use GPT-5.2 explicitly
-        proc = await asyncio.create_subprocess_shell(
-            f'codex exec -m {model} "{question}"',
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
-        
+        if proc is None:
+            proc = await spawn(spec)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(question.encode()), timeout=TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return ModelResponse(spec.model, "", False, f"Timeout after {TIMEOUT}s",
+                                 time.perf_counter() - started, warm)
+        latency = time.perf_counter() - started
+
         if proc.returncode == 0:
-            return ModelResponse("ChatGPT", stdout.decode().strip(), True)
+            return ModelResponse(spec.model, spec.clean(stdout), True, latency=latency, warm=warm)
         else:
-            return ModelResponse("ChatGPT", "", False, stderr.decode().strip())
-    except asyncio.TimeoutError:
-        return ModelResponse("ChatGPT", "", False, "Timeout after 120s")
+            return ModelResponse(spec.model, "", False, stderr.decode().strip(), latency, warm)
     except Exception as e:
-        return ModelResponse("ChatGPT", "", False, str(e))
+        return ModelResponse(spec.model, "", False, str(e), time.perf_counter() - started, warm)
+
+
+async def query_codex(question: str, model: str = "gpt-5.2") -> ModelResponse:
+    """Query ChatGPT via Codex CLI."""
+    return await ask(codex_spec(model), question)
 
 
 async def query_gemini(question: str, model: str = "gemini-3-pro-preview") -> ModelResponse:
     """Query Gemini via Gemini CLI."""
-    try:
-        # Use Gemini 3 Pro Preview (latest/best model)
-        proc = await asyncio.create_subprocess_shell(
-            f'gemini -p "{question}" -m {model} -o text',
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
-        
-        if proc.returncode == 0:
-            # Filter out log lines from gemini output
-            lines = stdout.decode().strip().split('\n')
-            output_lines = [l for l in lines if not l.startswith(('Loaded cached', 'Hook registry'))]
-            return ModelResponse("Gemini", '\n'.join(output_lines).strip(), True)
-        else:
-            return ModelResponse("Gemini", "", False, stderr.decode().strip())
-    except asyncio.TimeoutError:
-        return ModelResponse("Gemini", "", False, "Timeout after 120s")
-    except Exception as e:
-        return ModelResponse("Gemini", "", False, str(e))
+    return await ask(gemini_spec(model), question)
+
 
+class WorkerPool:
+    """
+    Keeps pre-spawned CLI processes parked on stdin so their startup
+    (Node boot, config and credential loading) overlaps the previous query.
+    Each query takes an idle process and immediately spawns its replacement.
+    """
 
-async def query_all(question: str) -> list[ModelResponse]:
+    def __init__(self, specs: list[CliSpec], size: int = 1):
+        self.specs = specs
+        self.size = size
+        self._idle: dict[str, asyncio.Queue] = {}
+        self._refills: set[asyncio.Task] = set()
+        self.stats: dict[str, dict[str, list[float]]] = {s.model: {"cold": [], "warm": []} for s in specs}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def start(self):
+        for spec in self.specs:
+            self._idle[spec.model] = asyncio.Queue()
+            for _ in range(self.size):
+                await self._park(spec)
+
+    async def _park(self, spec: CliSpec):
+        try:
+            proc = await spawn(spec)
+        except Exception as e:
+            print(f"[WARN] Could not pre-spawn {spec.model}: {e}", file=sys.stderr)
+            return
+        self._idle[spec.model].put_nowait(proc)
+
+    def _refill(self, spec: CliSpec):
+        task = asyncio.create_task(self._park(spec))
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    def _take(self, spec: CliSpec) -> Optional[asyncio.subprocess.Process]:
+        queue = self._idle[spec.model]
+        while not queue.empty():
+            proc = queue.get_nowait()
+            if proc.returncode is None:
+                return proc
+        return None
+
+    async def query(self, spec: CliSpec, question: str, cold: bool = False) -> ModelResponse:
+        """Answer from a parked process, or from a fresh one with cold=True (a baseline for summary())."""
+        proc = None
+        if not cold:
+            proc = self._take(spec)
+            self._refill(spec)
+        response = await ask(spec, question, proc)
+        if response.latency is not None:
+            self.stats[spec.model]["warm" if response.warm else "cold"].append(response.latency)
+        return response
+
+    async def query_all(self, question: str, cold: bool = False) -> list[ModelResponse]:
+        return await asyncio.gather(*(self.query(spec, question, cold) for spec in self.specs))
+
+    async def close(self):
+        if self._refills:
+            await asyncio.gather(*self._refills, return_exceptions=True)
+        for queue in self._idle.values():
+            while not queue.empty():
+                proc = queue.get_nowait()
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+
+    def summary(self) -> str:
+        """One line per model comparing cold-start and warm latency."""
+        lines = []
+        for model, runs in self.stats.items():
+            parts = []
+            for kind in ("cold", "warm"):
+                if runs[kind]:
+                    parts.append(f"{kind} {len(runs[kind])}x avg {sum(runs[kind]) / len(runs[kind]):.2f}s")
+            lines.append(f"{model}: {', '.join(parts) or 'no queries'}")
+        return '\n'.join(lines)
+
+
+async def query_all(question: str, pool: Optional[WorkerPool] = None) -> list[ModelResponse]:
     """Query ChatGPT and Gemini in parallel."""
+    if pool:
+        return await pool.query_all(question)
     tasks = [
         query_codex(question),
         query_gemini(question),
@@ -80,36 +209,116 @@ async def query_all(question: str) -> list[ModelResponse]:
     return await asyncio.gather(*tasks)
 
 
-def format_json(responses: list[ModelResponse], question: str) -> str:
+def format_json(responses: list[ModelResponse], question: str, indent: Optional[int] = 2,
+                agreement: bool = False) -> str:
     """Format as JSON for Clawdbot to process."""
-    return json.dumps({
+    result = {
         "question": question,
         "responses": [
             {
                 "model": r.model,
                 "success": r.success,
                 "response": r.response if r.success else None,
-                "error": r.error if not r.success else None
+                "error": r.error if not r.success else None,
+                "latency": round(r.latency, 3) if r.latency is not None else None,
+                "warm": r.warm
             }
             for r in responses
         ]
-    }, indent=2)
+    }
+    if agreement:
+        # Imported lazily so plain queries don't need numpy
+        try:
+            from agreement import score_agreement
+        except ImportError as e:
+            print(f"WARNING: agreement scoring skipped: {e}", file=sys.stderr)
+        else:
+            result["agreement"] = score_agreement(responses)
+    return json.dumps(result, indent=indent)
+
+
+async def run_batch(questions: list[str], jobs: int = 1, agreement: bool = False):
+    """Answer many questions through a warm pool, printing one JSON line each in input order."""
+    # One spare process per CLI keeps warming while the in-flight queries run
+    async with WorkerPool([codex_spec(), gemini_spec()], size=jobs + 1) as pool:
+        semaphore = asyncio.Semaphore(jobs)
+
+        async def one(question: str, cold: bool = False) -> list[ModelResponse]:
+            async with semaphore:
+                return await pool.query_all(question, cold)
+
+        # The first question cold-starts its own processes, so the summary has a baseline
+        # to compare the warm ones against. The rest wait for it: the parked processes were
+        # spawned before it, so once a full cold start is done they have booted too, and no
+        # warm latency includes the pool's own startup.
+        if questions:
+            print(format_json(await one(questions[0], cold=True), questions[0], indent=None,
+                              agreement=agreement), flush=True)
+        tasks = [asyncio.create_task(one(q)) for q in questions[1:]]
+        for question, task in zip(questions[1:], tasks):
+            print(format_json(await task, question, indent=None, agreement=agreement), flush=True)
+        print(pool.summary(), file=sys.stderr)
+
+
+async def run_daemon(agreement: bool = False):
+    """Read one question per stdin line and answer each from a warm pool."""
+    loop = asyncio.get_running_loop()
+    async with WorkerPool([codex_spec(), gemini_spec()]) as pool:
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            question = line.strip()
+            if not question:
+                continue
+            responses = await pool.query_all(question)
+            print(format_json(responses, question, indent=None, agreement=agreement), flush=True)
+        print(pool.summary(), file=sys.stderr)
 
 
 async def main():
-    if len(sys.argv) < 2:
-        print("Usage: council.py <question>")
-        print("Returns JSON with ChatGPT and Gemini responses.")
-        print("Claude response should be provided by the calling agent.")
+    parser = argparse.ArgumentParser(
+        description="Query ChatGPT and Gemini in parallel and print JSON. "
+                    "Claude response should be provided by the calling agent.")
+    parser.add_argument("question", nargs="?", help="Question to ask")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="Answer one question per line of FILE (default: stdin)")
+    parser.add_argument("--jobs", type=int, default=1, help="Batch questions in flight")
+    parser.add_argument("--daemon", action="store_true", help="Answer questions from stdin until EOF")
+    parser.add_argument("--agreement", action="store_true", help="Score agreement between the responses")
+    args = parser.parse_args()
+    if sum((args.question is not None, args.batch is not None, args.daemon)) != 1:
+        parser.print_usage()
+        print("Give a question, --batch [FILE] or --daemon.")
         sys.exit(1)
-    
-    question = sys.argv[1]
-    
+    if args.agreement:
+        # Fail before any query is sent rather than after paying for the answers
+        try:
+            import agreement as _agreement  # noqa: F401
+        except ImportError as e:
+            print(f"ERROR: --agreement needs numpy: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    if args.daemon:
+        print("Council daemon ready: one question per line on stdin...", file=sys.stderr)
+        await run_daemon(args.agreement)
+        return
+
+    if args.batch is not None:
+        if args.batch == '-':
+            questions = [l.strip() for l in sys.stdin if l.strip()]
+        else:
+            with open(args.batch, encoding='utf-8') as f:
+                questions = [l.strip() for l in f if l.strip()]
+        print(f"Querying ChatGPT and Gemini for {len(questions)} questions...", file=sys.stderr)
+        await run_batch(questions, max(1, args.jobs), args.agreement)
+        return
+
     print(f"Querying ChatGPT and Gemini...", file=sys.stderr)
     
-    responses = await query_all(question)
+    responses = await query_all(args.question)
     
-    print(format_json(responses, question))
+    print(format_json(responses, args.question, agreement=args.agreement))
 
 
 if __name__ == "__main__":
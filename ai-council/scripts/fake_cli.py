@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Stub model CLI for exercising council.py offline.
+Sleeps to simulate CLI startup, reads the question from stdin, sleeps to
+simulate the model, then echoes a canned answer.
+
+Usage:
+    COUNCIL_CODEX_BIN="python fake_cli.py" COUNCIL_GEMINI_BIN="python fake_cli.py" \
+        python council.py --batch questions.txt
+
+Environment:
+    FAKE_CLI_STARTUP       seconds of startup cost before stdin is read (default 1.0)
+    FAKE_CLI_DELAY         seconds of "thinking" per question (default 0.5)
+    FAKE_CLI_OUTPUT_BYTES  pad the answer to roughly this many bytes (default 0)
+    FAKE_CLI_FAIL_RATE     probability of exiting non-zero (default 0)
+    FAKE_CLI_NOISE_LINES   log lines printed before the answer (default 1)
+"""
+
+import os
+import random
+import sys
+import time
+
+NOISE = ("Loaded cached credentials.", "Hook registry initialized with 0 hook entries")
+
+
+def main():
+    startup = float(os.environ.get("FAKE_CLI_STARTUP", "1.0"))
+    delay = float(os.environ.get("FAKE_CLI_DELAY", "0.5"))
+    output_bytes = int(os.environ.get("FAKE_CLI_OUTPUT_BYTES", "0"))
+    fail_rate = float(os.environ.get("FAKE_CLI_FAIL_RATE", "0"))
+    noise_lines = int(os.environ.get("FAKE_CLI_NOISE_LINES", "1"))
+
+    time.sleep(startup)
+    for i in range(noise_lines):
+        print(NOISE[i % len(NOISE)], flush=True)
+
+    question = sys.stdin.read().strip()
+    time.sleep(delay)
+
+    if random.random() < fail_rate:
+        print("Error: simulated model failure", file=sys.stderr)
+        sys.exit(1)
+
+    answer = f"Stub answer from {' '.join(sys.argv[1:])}: {question}"
+    filler = "lorem ipsum dolor sit amet "
+    while len(answer) < output_bytes:
+        answer += "\n" + filler * 3
+    print(answer)
+
+
+if __name__ == "__main__":
+    main()
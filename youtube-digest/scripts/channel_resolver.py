@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Resolve YouTube handles / channel URLs to channel IDs.
+
+A channel page is often over 1 MB, but the ID shows up early (the canonical
+link in <head>, or "externalId" in the page data). The resolver streams the
+response, scans it as it arrives and closes the connection at the first
+match. Results are kept in data/youtube-channel-ids.json, so a handle is only
+ever fetched once, and bulk imports resolve concurrently over one pooled
+session. OPML and Takeout CSV exports already carry channel IDs and need no
+network at all.
+
+Usage:
+    python channel_resolver.py resolve @handle [URL ...] [--workers 16]
+    python channel_resolver.py import subscriptions.opml|.csv|.txt [--category tech] [--dry-run] [--workers 16]
+
+Requirements:
+    pip install requests
+"""
+
+import argparse
+import csv
+import html
+import json
+import os
+import re
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DATA_DIR = Path(os.path.expanduser("~/.openclaw/workspace")) / "data"
+CHANNEL_URL = "https://www.youtube.com/{}"
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={}"
+REQUEST_TIMEOUT = 15
+CHUNK_SIZE = 16384
+# Give up on pages that never mention an ID (consent walls, error pages)
+MAX_SCAN_BYTES = 4 * 1024 * 1024
+
+CHANNEL_ID_RE = re.compile(r"UC[\w-]{22}")
+PAGE_ID_RE = re.compile(
+    rb'<link rel="canonical" href="https://www\.youtube\.com/channel/(UC[\w-]{22})"'
+    rb'|"externalId":"(UC[\w-]{22})"'
+)
+TITLE_RE = re.compile(rb'<meta property="og:title" content="([^"]*)"')
+# Longest match we might miss across a chunk boundary
+OVERLAP = 160
+
+
+def parse_channel_ref(value: str) -> tuple[str, str]:
+    """
+    Normalise user input to ("id", "UC...") or ("handle", "@name").
+    Accepts bare handles and IDs, /@handle, /channel/UC..., /c/name and /user/name URLs,
+    with or without tracking params.
+    """
+    value = value.strip()
+    if CHANNEL_ID_RE.fullmatch(value):
+        return "id", value
+    if value.startswith("@"):
+        return "handle", value.split("?")[0].split("/")[0]
+
+    url = urlparse(value if "://" in value else f"https://{value}")
+    parts = [p for p in url.path.split("/") if p]
+    if parts and parts[0] == "channel" and len(parts) > 1 and CHANNEL_ID_RE.fullmatch(parts[1]):
+        return "id", parts[1]
+    if parts and parts[0].startswith("@"):
+        return "handle", parts[0]
+    if len(parts) > 1 and parts[0] in ("c", "user"):
+        return "handle", f"{parts[0]}/{parts[1]}"
+    channel_id = parse_qs(url.query).get("channel_id", [""])[0]
+    if CHANNEL_ID_RE.fullmatch(channel_id):
+        return "id", channel_id
+    raise ValueError(f"Not a channel handle or URL: {value}")
+
+
+class ChannelResolver:
+    """Handle -> channel ID lookups with a persistent cache and a pooled session."""
+
+    def __init__(self, data_dir: Path = DATA_DIR, workers: int = 16):
+        self.workers = workers
+        self.cache_path = data_dir / "youtube-channel-ids.json"
+        self.cache = json.loads(self.cache_path.read_text(encoding="utf-8")) if self.cache_path.exists() else {}
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = "Mozilla/5.0 (openclaw youtube-digest)"
+        self.session.headers["Accept-Language"] = "en"
+        # Skip the EU consent interstitial, which has no channel data
+        self.session.cookies.set("CONSENT", "YES+", domain=".youtube.com")
+
+    def scan(self, handle: str) -> dict:
+        """Stream the channel page and stop at the first channel ID."""
+        url = CHANNEL_URL.format(handle)
+        with self.session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code != 200:
+                raise LookupError(f"HTTP {response.status_code}")
+            buffer = b""
+            read = 0
+            name = None
+            for chunk in response.iter_content(CHUNK_SIZE):
+                read += len(chunk)
+                buffer = buffer[-OVERLAP:] + chunk
+                if name is None:
+                    title = TITLE_RE.search(buffer)
+                    if title:
+                        name = html.unescape(title.group(1).decode("utf-8", "replace"))
+                match = PAGE_ID_RE.search(buffer)
+                if match:
+                    channel_id = (match.group(1) or match.group(2)).decode()
+                    return {"channelId": channel_id, "name": name, "bytes": read}
+                if read >= MAX_SCAN_BYTES:
+                    break
+        raise LookupError(f"No channel ID in first {read // 1024} KB of {url}")
+
+    def resolve(self, value: str) -> dict:
+        """
+        Resolve one handle/URL/ID to {handle, channelId, name, source}.
+        source is "input" (ID given), "cache" or "fetched".
+        """
+        kind, ref = parse_channel_ref(value)
+        if kind == "id":
+            return {"handle": None, "channelId": ref, "name": None, "source": "input"}
+
+        key = ref.lower()
+        with self._lock:
+            cached = self.cache.get(key)
+        if cached:
+            return {"handle": ref, **cached, "source": "cache"}
+
+        found = self.scan(ref)
+        entry = {
+            "channelId": found["channelId"],
+            "name": found["name"],
+            "resolvedAt": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self.cache[key] = entry
+        return {"handle": ref, **entry, "source": "fetched", "bytes": found["bytes"]}
+
+    def resolve_many(self, values: Iterable[str]):
+        """Yield (input, result, error) as lookups complete; saves the cache at the end."""
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(self.resolve, v): v for v in values}
+                for future in as_completed(futures):
+                    try:
+                        yield futures[future], future.result(), None
+                    except (requests.RequestException, LookupError, ValueError) as e:
+                        yield futures[future], None, str(e)
+        finally:
+            self.save_cache()
+
+    def save_cache(self):
+        with self._lock:
+            tmp = self.cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.cache, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp, self.cache_path)
+
+
+def read_import_file(path: Path) -> list[dict]:
+    """
+    Parse a subscription export into [{"ref", "name"}]; ref is whatever the file gives
+    (channel ID, URL or handle) and goes through parse_channel_ref later.
+      .opml  outlines with xmlUrl=...channel_id=UC... (YouTube / feed reader exports)
+      .csv   Takeout subscriptions.csv (Channel Id, Channel Url, Channel Title)
+      other  one handle or URL per line
+    """
+    suffix = path.suffix.lower()
+    items = []
+    if suffix in (".opml", ".xml"):
+        root = ET.parse(path).getroot()
+        for outline in root.iter("outline"):
+            ref = outline.get("xmlUrl") or outline.get("htmlUrl")
+            if ref:
+                items.append({"ref": ref, "name": outline.get("title") or outline.get("text")})
+    elif suffix == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                row = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+                ref = row.get("channel id") or row.get("channel url") or row.get("handle")
+                if ref:
+                    items.append({"ref": ref, "name": row.get("channel title") or row.get("name")})
+    else:
+        for line in path.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                items.append({"ref": line, "name": None})
+    return items
+
+
+def import_channels(path: Path, categories: list[str], resolver: ChannelResolver,
+                    data_dir: Path = DATA_DIR, dry_run: bool = False) -> dict:
+    """Resolve an export and add new channels to youtube-channels.json."""
+    items = read_import_file(path)
+    names = {item["ref"]: item["name"] for item in items}
+
+    channels_path = data_dir / "youtube-channels.json"
+    if channels_path.exists():
+        watchlist = json.loads(channels_path.read_text(encoding="utf-8"))
+    else:
+        watchlist = {"channels": [], "lastDigest": None, "customCategories": []}
+    known = {c["channelId"] for c in watchlist["channels"]}
+
+    added, skipped, errors = [], 0, []
+    for ref, result, error in resolver.resolve_many(names):
+        if error:
+            errors.append({"input": ref, "error": error})
+            continue
+        channel_id = result["channelId"]
+        if channel_id in known:
+            skipped += 1
+            continue
+        known.add(channel_id)
+        added.append({
+            "name": names[ref] or result["name"] or result["handle"] or channel_id,
+            "handle": result["handle"],
+            "channelId": channel_id,
+            "feedUrl": FEED_URL.format(channel_id),
+            "categories": categories,
+            "addedAt": datetime.now().isoformat(timespec="seconds"),
+        })
+
+    if added and not dry_run:
+        watchlist["channels"].extend(added)
+        tmp = channels_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(watchlist, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, channels_path)
+    return {"added": added, "skipped": skipped, "errors": errors}
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--workers", type=int, default=16, help="Concurrent page fetches")
+    common.add_argument("--data-dir", default=str(DATA_DIR), help="Workspace data directory")
+    parser = argparse.ArgumentParser(description="Resolve YouTube handles to channel IDs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    resolve = sub.add_parser("resolve", parents=[common], help="Print channel IDs for handles or URLs")
+    resolve.add_argument("refs", nargs="+")
+    imp = sub.add_parser("import", parents=[common], help="Add channels from an OPML / CSV / text export")
+    imp.add_argument("file")
+    imp.add_argument("--category", action="append", help="Category for imported channels (repeatable)")
+    imp.add_argument("--dry-run", action="store_true", help="Resolve but don't write the watchlist")
+    args = parser.parse_args()
+
+    data_dir = Path(os.path.expanduser(args.data_dir))
+    data_dir.mkdir(parents=True, exist_ok=True)
+    resolver = ChannelResolver(data_dir, args.workers)
+    start = time.time()
+
+    if args.command == "resolve":
+        results = {}
+        for ref, result, error in resolver.resolve_many(args.refs):
+            results[ref] = result or {"error": error}
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        report = import_channels(Path(args.file), args.category or ["other"], resolver, data_dir, args.dry_run)
+        print(f"[INFO] Added {len(report['added'])}, already watched {report['skipped']}, "
+              f"failed {len(report['errors'])} in {time.time() - start:.1f}s", file=sys.stderr)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
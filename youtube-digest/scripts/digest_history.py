@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Append-only digest history store.
+
+Replaces the single youtube-digest-history.json (rewritten and pruned on
+every digest) with one NDJSON segment per UTC day under
+data/youtube-digest-history/, one row per video. The file name is the
+timestamp index: a "last N hours" read only opens the segments that overlap
+the window, appends only touch today's segment, and retention deletes whole
+segment files. The legacy JSON file is imported whenever it has changed
+since the last import, skipping digests the store already holds.
+
+Usage:
+    python digest_history.py append [digest.json|-] [--keep-days 7]
+    python digest_history.py query [--hours 24]
+    python digest_history.py prune [--keep-days 7]
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+DATA_DIR = Path(os.path.expanduser("~/.openclaw/workspace")) / "data"
+SEGMENT_SUFFIX = ".ndjson"
+# Size and mtime of the legacy file as last imported
+MIGRATED_MARKER = ".migrated"
+
+
+def parse_time(value: str) -> datetime:
+    """Parse an ISO timestamp; naive values are taken as local time."""
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.astimezone()
+
+
+class DigestHistory:
+    """Day-segmented NDJSON rows of {digest, videoId, title, channel, category, publishedAt, url}."""
+
+    def __init__(self, data_dir: Path = DATA_DIR):
+        self.root = data_dir / "youtube-digest-history"
+        self.legacy_path = data_dir / "youtube-digest-history.json"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.migrate()
+
+    def _segment(self, day: str) -> Path:
+        return self.root / f"{day}{SEGMENT_SUFFIX}"
+
+    def append(self, timestamp: str, videos: list[dict]):
+        """Append one digest's videos to the segment for its UTC day."""
+        day = parse_time(timestamp).astimezone(timezone.utc).strftime("%Y-%m-%d")
+        with open(self._segment(day), "a", encoding="utf-8") as f:
+            for video in videos:
+                f.write(json.dumps({"digest": timestamp, **video}, ensure_ascii=False) + "\n")
+
+    def rows(self, since: datetime, until: Optional[datetime] = None) -> Iterator[dict]:
+        """Yield rows whose digest timestamp falls in [since, until), opening only overlapping segments."""
+        first_day = since.astimezone(timezone.utc).strftime("%Y-%m-%d")
+        last_day = until.astimezone(timezone.utc).strftime("%Y-%m-%d") if until else None
+        for path in sorted(self.root.glob(f"*{SEGMENT_SUFFIX}")):
+            day = path.stem
+            if day < first_day or (last_day and day > last_day):
+                continue
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                        ts = parse_time(row["digest"])
+                    except (json.JSONDecodeError, KeyError, ValueError):
+                        continue
+                    if ts >= since and (until is None or ts < until):
+                        yield row
+
+    def digests(self, since: datetime, until: Optional[datetime] = None) -> list[dict]:
+        """Rows regrouped into the legacy {timestamp, videos} digest shape."""
+        grouped: dict[str, list[dict]] = {}
+        for row in self.rows(since, until):
+            timestamp = row.pop("digest")
+            grouped.setdefault(timestamp, []).append(row)
+        return [{"timestamp": ts, "videos": videos} for ts, videos in grouped.items()]
+
+    def prune(self, keep_days: int = 7) -> int:
+        """Delete whole segments older than keep_days; returns how many were dropped."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=keep_days)).strftime("%Y-%m-%d")
+        dropped = 0
+        for path in self.root.glob(f"*{SEGMENT_SUFFIX}"):
+            if path.stem < cutoff:
+                path.unlink()
+                dropped += 1
+        return dropped
+
+    def migrate(self):
+        """
+        Import the legacy single-file history, leaving the old file in place.
+        A no-op unless the file changed since the last import (it may appear,
+        be restored or still be written by an older script after the store
+        exists); digests already in the store are not imported twice.
+        """
+        if not self.legacy_path.exists():
+            return
+        marker = self.root / MIGRATED_MARKER
+        stat = self.legacy_path.stat()
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if marker.exists() and marker.read_text().strip() == signature:
+            return
+        try:
+            with open(self.legacy_path, encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARN] Could not import {self.legacy_path}: {e}", file=sys.stderr)
+            return
+        present = {row["digest"] for row in self.rows(datetime.min.replace(tzinfo=timezone.utc))}
+        imported = 0
+        for digest in sorted(legacy.get("digests", []), key=lambda d: d.get("timestamp", "")):
+            if digest.get("timestamp") in present:
+                continue
+            try:
+                self.append(digest["timestamp"], digest.get("videos", []))
+            except (KeyError, ValueError):
+                continue
+            imported += 1
+        marker.write_text(signature)
+        if imported:
+            print(f"[INFO] Imported {imported} digests from {self.legacy_path.name}", file=sys.stderr)
+
+
+def _digest_from_input(data: dict) -> tuple[str, list[dict]]:
+    """Accept {timestamp, videos} or rss_poller.py output and normalise video rows."""
+    timestamp = data.get("timestamp") or datetime.now().astimezone().isoformat(timespec="seconds")
+    videos = []
+    for v in data.get("videos", []):
+        videos.append({
+            "videoId": v.get("videoId"),
+            "title": v.get("title"),
+            "channel": v.get("channel"),
+            "category": v.get("category") or (v.get("categories") or ["other"])[0],
+            "publishedAt": v.get("publishedAt") or v.get("published"),
+            "url": v.get("url") or f"https://youtube.com/watch?v={v.get('videoId')}",
+        })
+    return timestamp, videos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YouTube digest history store")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Workspace data directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    append = sub.add_parser("append", help="Record a digest")
+    append.add_argument("input", nargs="?", default="-", help="Digest JSON file or - for stdin")
+    append.add_argument("--keep-days", type=int, default=7, help="Retention after appending")
+    query = sub.add_parser("query", help="Print digests from the last N hours")
+    query.add_argument("--hours", type=float, default=24)
+    prune = sub.add_parser("prune", help="Drop segments past retention")
+    prune.add_argument("--keep-days", type=int, default=7)
+    args = parser.parse_args()
+
+    history = DigestHistory(Path(os.path.expanduser(args.data_dir)))
+
+    if args.command == "append":
+        raw = sys.stdin.read() if args.input == "-" else Path(args.input).read_text(encoding="utf-8")
+        timestamp, videos = _digest_from_input(json.loads(raw))
+        history.append(timestamp, videos)
+        dropped = history.prune(args.keep_days)
+        print(f"[INFO] Recorded {len(videos)} videos at {timestamp}; dropped {dropped} old segments")
+    elif args.command == "query":
+        since = datetime.now(timezone.utc) - timedelta(hours=args.hours)
+        print(json.dumps({"digests": history.digests(since)}, ensure_ascii=False, indent=2))
+    else:
+        print(f"[INFO] Dropped {history.prune(args.keep_days)} old segments")
+
+
+if __name__ == "__main__":
+    main()
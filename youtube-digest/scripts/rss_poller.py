@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Poll watchlist RSS feeds concurrently with conditional GET.
+
+Reads data/youtube-channels.json and fetches every channel's feed over one
+pooled requests.Session. ETag / Last-Modified are stored per channel, so
+unchanged feeds come back as a bodyless 304 and are served from the local
+feed cache. Network cost scales with how many channels actually posted.
+
+Usage:
+    python rss_poller.py [--category tech] [--since ISO | --hours 24] [--workers 16]
+                         [--data-dir ~/.openclaw/workspace/data]
+
+Requirements:
+    pip install requests
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from feed_parser import iter_entries, parse_time
+
+DATA_DIR = Path(os.path.expanduser("~/.openclaw/workspace")) / "data"
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={}"
+REQUEST_TIMEOUT = 15
+
+
+@dataclass
+class FeedResult:
+    channel: dict
+    status: str  # "fetched", "not_modified" or "error"
+    body: Optional[bytes] = None
+    error: Optional[str] = None
+
+
+def load_channels(data_dir: Path = DATA_DIR) -> dict:
+    with open(data_dir / "youtube-channels.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FeedPoller:
+    """Concurrent feed fetcher with per-channel validators and a body cache."""
+
+    def __init__(self, data_dir: Path = DATA_DIR, workers: int = 16):
+        self.workers = workers
+        self.state_path = data_dir / "youtube-feed-state.json"
+        self.cache_dir = data_dir / "youtube-feed-cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.state = json.loads(self.state_path.read_text()) if self.state_path.exists() else {}
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = "Mozilla/5.0 (openclaw youtube-digest)"
+
+    def fetch(self, channel: dict) -> FeedResult:
+        channel_id = channel["channelId"]
+        cached = self.cache_dir / f"{channel_id}.xml"
+        validators = self.state.get(channel_id, {}) if cached.exists() else {}
+
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        url = channel.get("feedUrl") or FEED_URL.format(channel_id)
+        try:
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            return FeedResult(channel, "error", error=str(e))
+
+        if response.status_code == 304:
+            return FeedResult(channel, "not_modified", body=cached.read_bytes())
+        if response.status_code != 200:
+            return FeedResult(channel, "error", error=f"HTTP {response.status_code}")
+
+        cached.write_bytes(response.content)
+        with self._lock:
+            self.state[channel_id] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            }
+        return FeedResult(channel, "fetched", body=response.content)
+
+    def poll(self, channels: list[dict]) -> Iterator[FeedResult]:
+        """Yield feed results as they complete."""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self.fetch, c) for c in channels]
+            for future in as_completed(futures):
+                yield future.result()
+        self.save_state()
+
+    def save_state(self):
+        with self._lock:
+            tmp = self.state_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.state, indent=2))
+            os.replace(tmp, self.state_path)
+
+
+def parse_feed(body: bytes, channel: dict, since: Optional[datetime] = None) -> list[dict]:
+    """Extract entries newer than `since`, reading no further than the watermark."""
+    return [
+        {
+            "videoId": entry.video_id,
+            "title": entry.title,
+            "published": entry.published,
+            "channel": channel.get("name") or entry.channel,
+            "channelId": channel["channelId"],
+            "categories": channel.get("categories", ["other"]),
+            "url": f"https://youtube.com/watch?v={entry.video_id}",
+        }
+        for entry in iter_entries(body, since)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll YouTube channel RSS feeds")
+    parser.add_argument("--category", help="Only channels in this category")
+    parser.add_argument("--since", help="ISO timestamp (default: lastDigest)")
+    parser.add_argument("--hours", type=float, help="Only videos from the last N hours")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent requests")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Workspace data directory")
+    args = parser.parse_args()
+
+    data_dir = Path(os.path.expanduser(args.data_dir))
+    watchlist = load_channels(data_dir)
+    channels = [c for c in watchlist["channels"]
+                if not args.category or args.category in c.get("categories", [])]
+
+    if args.hours:
+        since = datetime.now(timezone.utc) - timedelta(hours=args.hours)
+    elif args.since or watchlist.get("lastDigest"):
+        since = parse_time(args.since or watchlist["lastDigest"])
+    else:
+        since = datetime.now(timezone.utc) - timedelta(hours=24)
+
+    start = time.time()
+    poller = FeedPoller(data_dir, args.workers)
+    videos, errors = [], []
+    counts = {"fetched": 0, "not_modified": 0, "error": 0}
+    for result in poller.poll(channels):
+        counts[result.status] += 1
+        if result.status == "error":
+            errors.append({"channel": result.channel.get("name"), "error": result.error})
+            continue
+        try:
+            videos.extend(parse_feed(result.body, result.channel, since))
+        except (ET.ParseError, ValueError) as e:
+            # ValueError: an unparseable <published> date
+            errors.append({"channel": result.channel.get("name"), "error": f"Bad feed: {e}"})
+
+    videos.sort(key=lambda v: v["published"], reverse=True)
+    print(f"[INFO] {len(channels)} feeds: {counts['fetched']} fetched, {counts['not_modified']} unchanged, "
+          f"{counts['error']} failed in {time.time() - start:.1f}s", file=sys.stderr)
+    print(json.dumps({
+        "since": since.isoformat(),
+        "videos": videos,
+        "errors": errors,
+        "stats": {"channels": len(channels), **counts},
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
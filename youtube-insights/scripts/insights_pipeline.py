@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Pipelined feed -> transcript -> chunk engine for youtube-insights.
+
+Three concurrent stages joined by bounded queues:
+  1. poll        feeds are fetched concurrently (rss_poller.FeedPoller); each video
+                 is queued as soon as its feed returns
+  2. transcript  N workers fetch transcripts (cache, retries, index) as videos arrive
+  3. chunk       results are split into token-budgeted chunks and printed as JSONL
+
+Bounded queues keep a slow stage from piling up work behind it. Feeds are parsed
+once against the widest window; if the primary window has fewer than
+--min-videos, the older entries already in hand are queued, with no refetch.
+
+Usage:
+    python insights_pipeline.py [--category ai] [--hours 24] [--fallback-hours 48] [--min-videos 3]
+                                [--concurrency 8] [--max-tokens 1500] [--language en]
+                                [--no-cache] [--no-index]
+
+Output (JSONL, completion order):
+    {"video_id", "title", "channel", "url", "published", "language", "chunks": [...]}
+    {"video_id", ..., "error": "..."}
+    {"summary": {"window_hours", "videos", "failed", "feeds", "feed_errors", "poll_errors",
+                 "poll_failed", "first_transcript_at", "elapsed"}}
+
+Poll failures (an unreachable or malformed feed, a video with a missing or
+unparseable date, or the stage itself) are listed and counted in the summary
+but do not change the exit code. Exits 1 only when no feed could be polled at
+all, or when every video found failed to fetch.
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SKILLS_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SKILLS_DIR / "youtube-digest" / "scripts"))
+sys.path.insert(0, str(SKILLS_DIR / "youtube-summarize" / "scripts"))
+from rss_poller import DATA_DIR, FeedPoller, load_channels, parse_feed, parse_time
+from batch_transcripts import fetch_with_retry
+from transcript_cache import TranscriptCache
+from transcript_chunks import chunk_transcript
+from transcript_index import TranscriptIndex
+
+# Marks the end of a stage's output; one per downstream worker
+DONE = None
+
+
+class InsightsPipeline:
+    def __init__(self, args):
+        self.args = args
+        self.cache = None if args.no_cache else TranscriptCache()
+        self.index = None if args.no_index else TranscriptIndex()
+        self.videos = queue.Queue(maxsize=args.queue_size)
+        self.results = queue.Queue(maxsize=args.queue_size)
+        self.stats = {"feeds": 0, "feed_errors": [], "poll_errors": [], "window_hours": args.hours,
+                      "queued": 0, "first_transcript_at": None}
+        self.start = time.time()
+
+    def poll(self, channels: list[dict]):
+        """Stage 1: queue videos from each feed as it arrives; widen the window at the end if needed."""
+        now = datetime.now(timezone.utc)
+        primary = now - timedelta(hours=self.args.hours)
+        widest = now - timedelta(hours=max(self.args.hours, self.args.fallback_hours))
+        held, seen = [], set()
+        try:
+            poller = FeedPoller(self.args.data_dir, self.args.workers)
+            for result in poller.poll(channels):
+                self.stats["feeds"] += 1
+                if result.status == "error":
+                    self.stats["feed_errors"].append({"channel": result.channel.get("name"), "error": result.error})
+                    continue
+                try:
+                    entries = parse_feed(result.body, result.channel, widest)
+                except (ET.ParseError, ValueError) as e:
+                    self.stats["feed_errors"].append({"channel": result.channel.get("name"), "error": f"Bad feed: {e}"})
+                    continue
+                for video in entries:
+                    if video["videoId"] in seen:
+                        continue
+                    seen.add(video["videoId"])
+                    try:
+                        published = parse_time(video["published"] or "")
+                    except ValueError:
+                        print(f"[WARN] Skipping {video['videoId']} ({video['channel']}): "
+                              f"bad published date {video['published']!r}", file=sys.stderr)
+                        self.stats["poll_errors"].append({"video_id": video["videoId"], "channel": video["channel"],
+                                                          "error": f"Bad published date: {video['published']!r}"})
+                        continue
+                    if published > primary:
+                        self._queue(video)
+                    else:
+                        held.append(video)
+
+            if self.stats["queued"] < self.args.min_videos and held:
+                self.stats["window_hours"] = self.args.fallback_hours
+                print(f"[INFO] Only {self.stats['queued']} videos in {self.args.hours:g}h, "
+                      f"widening to {self.args.fallback_hours:g}h (+{len(held)})", file=sys.stderr)
+                for video in held:
+                    self._queue(video)
+        except Exception as e:
+            # Don't let the thread die silently: the videos queued so far still get processed
+            print(f"[ERROR] Poll stage failed: {e}", file=sys.stderr)
+            self.stats["poll_errors"].append({"error": f"Poll stage failed: {type(e).__name__}: {e}"})
+        finally:
+            for _ in range(self.args.concurrency):
+                self.videos.put(DONE)
+
+    def _queue(self, video: dict):
+        self.stats["queued"] += 1
+        self.videos.put(video)
+
+    def fetch(self):
+        """Stage 2: transcript worker."""
+        try:
+            while True:
+                video = self.videos.get()
+                if video is DONE:
+                    break
+                if self.stats["first_transcript_at"] is None:
+                    self.stats["first_transcript_at"] = round(time.time() - self.start, 2)
+                try:
+                    result = fetch_with_retry(video["videoId"], self.args.language, self.cache,
+                                              self.args.retries, self.args.backoff)
+                except Exception as e:
+                    result = {"error": str(e)}
+                if self.index and "segments" in result:
+                    self.index.add(video["videoId"], result["language"], result["segments"],
+                                   video["title"], video["channel"], video["published"])
+                self.results.put((video, result))
+        finally:
+            self.results.put(DONE)
+
+    def chunk(self, out):
+        """Stage 3: chunk finished transcripts and write JSONL; runs on the calling thread."""
+        finished, failed, written = 0, 0, 0
+        while finished < self.args.concurrency:
+            item = self.results.get()
+            if item is DONE:
+                finished += 1
+                continue
+            video, result = item
+            record = {
+                "video_id": video["videoId"],
+                "title": video["title"],
+                "channel": video["channel"],
+                "url": video["url"],
+                "published": video["published"],
+            }
+            if "segments" in result:
+                record["language"] = result["language"]
+                record["chunks"] = chunk_transcript(result, self.args.max_tokens)
+            else:
+                record["error"] = result.get("error", "Unknown error")
+                failed += 1
+            written += 1
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+        return written, failed
+
+    def run(self, channels: list[dict], out=sys.stdout) -> dict:
+        threads = [threading.Thread(target=self.poll, args=(channels,), daemon=True)]
+        threads += [threading.Thread(target=self.fetch, daemon=True) for _ in range(self.args.concurrency)]
+        for t in threads:
+            t.start()
+        written, failed = self.chunk(out)
+        for t in threads:
+            t.join()
+
+        summary = {
+            "window_hours": self.stats["window_hours"],
+            "videos": written,
+            "failed": failed,
+            "feeds": self.stats["feeds"],
+            "feed_errors": self.stats["feed_errors"],
+            "poll_errors": self.stats["poll_errors"],
+            "poll_failed": len(self.stats["feed_errors"]) + len(self.stats["poll_errors"]),
+            "first_transcript_at": self.stats["first_transcript_at"],
+            "elapsed": round(time.time() - self.start, 2),
+        }
+        out.write(json.dumps({"summary": summary}, ensure_ascii=False) + "\n")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipelined YouTube insights fetcher")
+    parser.add_argument("--category", help="Only channels in this category")
+    parser.add_argument("--hours", type=float, default=24, help="Primary time window")
+    parser.add_argument("--fallback-hours", type=float, default=48, help="Window if too few videos")
+    parser.add_argument("--min-videos", type=int, default=3, help="Widen the window below this")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent feed requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent transcript fetches")
+    parser.add_argument("--queue-size", type=int, help="Bound on each stage queue (default 2x concurrency)")
+    parser.add_argument("--retries", type=int, default=2, help="Retries for transient errors")
+    parser.add_argument("--backoff", type=float, default=1.0, help="Base backoff seconds")
+    parser.add_argument("--max-tokens", type=int, default=1500, help="Token budget per chunk")
+    parser.add_argument("--language", help="Preferred transcript language")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the transcript cache")
+    parser.add_argument("--no-index", action="store_true", help="Skip the full-text index")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Workspace data directory")
+    args = parser.parse_args()
+    args.data_dir = Path(os.path.expanduser(args.data_dir))
+    args.queue_size = args.queue_size or 2 * args.concurrency
+
+    watchlist = load_channels(args.data_dir)
+    channels = [c for c in watchlist["channels"]
+                if not args.category or args.category in c.get("categories", [])]
+    if not channels:
+        print(f"[ERROR] No channels{' in ' + args.category if args.category else ''}")
+        sys.exit(1)
+
+    summary = InsightsPipeline(args).run(channels)
+    print(f"[INFO] {summary['videos']} videos ({summary['failed']} failed) from {summary['feeds']} feeds "
+          f"({summary['poll_failed']} poll failures) in {summary['window_hours']:g}h window; "
+          f"first transcript at {summary['first_transcript_at']}s, done in {summary['elapsed']}s", file=sys.stderr)
+    nothing_polled = summary["feeds"] == len(summary["feed_errors"])
+    all_failed = summary["videos"] > 0 and summary["failed"] == summary["videos"]
+    sys.exit(1 if nothing_polled or all_failed else 0)
+
+
+if __name__ == "__main__":
+    main()
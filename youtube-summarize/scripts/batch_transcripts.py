@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Fetch transcripts for many videos concurrently.
+Prints one JSON line per video as soon as it finishes (completion order),
+including per-video errors, so callers can start on early results.
+
+Usage:
+    python batch_transcripts.py <url_or_id> [<url_or_id> ...] [options]
+    python batch_transcripts.py - < video_ids.txt
+
+Options:
+    --concurrency N   Parallel fetches (default 8)
+    --retries N       Retries per video for transient errors (default 2)
+    --backoff SECS    Base backoff, doubled each retry (default 1.0)
+    --language LANG   Preferred transcript language
+    --no-cache        Bypass the transcript cache
+    --no-dedupe       Keep rolling-caption repeats in auto-generated transcripts
+    --no-index        Don't add fetched transcripts to the full-text index
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from youtube_transcript import extract_video_id, get_transcript, segments_for_index
+from transcript_cache import TranscriptCache
+from transcript_index import TranscriptIndex
+
+
+def fetch_with_retry(video_id: str, language: str, cache: TranscriptCache,
+                     retries: int, backoff: float, dedupe: bool = True) -> dict:
+    """Fetch one transcript, retrying transient failures with exponential backoff."""
+    for attempt in range(retries + 1):
+        result = get_transcript(video_id, language, cache, dedupe)
+        error = result.get("error")
+        if not error or not result.get("retryable") or attempt == retries:
+            break
+        time.sleep(backoff * (2 ** attempt) * (1 + random.random() * 0.25))
+    result.setdefault("video_id", video_id)
+    result["attempts"] = attempt + 1
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch YouTube transcripts concurrently as JSONL")
+    parser.add_argument("videos", nargs="+", help="Video URLs or IDs, or - to read them from stdin")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel fetches")
+    parser.add_argument("--retries", type=int, default=2, help="Retries for transient errors")
+    parser.add_argument("--backoff", type=float, default=1.0, help="Base backoff seconds")
+    parser.add_argument("--language", help="Preferred transcript language")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the transcript cache")
+    parser.add_argument("--no-dedupe", action="store_true", help="Keep rolling-caption repeats")
+    parser.add_argument("--no-index", action="store_true", help="Skip the full-text index")
+    args = parser.parse_args()
+
+    inputs = args.videos
+    if inputs == ["-"]:
+        inputs = [line.strip() for line in sys.stdin if line.strip()]
+
+    cache = None if args.no_cache else TranscriptCache()
+    index = None if args.no_index else TranscriptIndex()
+    start = time.time()
+    failures = 0
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = {}
+        for raw in dict.fromkeys(inputs):
+            try:
+                video_id = extract_video_id(raw)
+            except ValueError as e:
+                print(json.dumps({"input": raw, "error": str(e)}), flush=True)
+                failures += 1
+                continue
+            futures[pool.submit(fetch_with_retry, video_id, args.language, cache,
+                                args.retries, args.backoff, not args.no_dedupe)] = raw
+
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"error": str(e)}
+            result["input"] = futures[future]
+            if index and "segments" in result:
+                # Without --no-dedupe the segments are already deduplicated
+                segments = segments_for_index(result["is_generated"], result["segments"]) \
+                    if args.no_dedupe else result["segments"]
+                index.add(result["video_id"], result["language"], segments)
+            failures += "error" in result
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    print(f"[INFO] {len(inputs)} videos, {failures} failed, {time.time() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+On-disk transcript cache for youtube_transcript.py.
+
+Transcripts are stored in a single SQLite file keyed by (video_id, language),
+with segments packed column-wise and zlib-compressed. Requests are mapped to
+the language they resolved to, so `--language de` falling back to English
+hits the English entry next time. Least-recently-used entries are evicted
+once the cache grows past its size cap.
+
+Usage:
+    python transcript_cache.py stats
+    python transcript_cache.py clear
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "YT_TRANSCRIPT_CACHE",
+    os.path.expanduser("~/.openclaw/cache/youtube-transcripts")
+))
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB of compressed segments
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    is_generated INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (video_id, language)
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    video_id TEXT NOT NULL,
+    requested TEXT NOT NULL,
+    language TEXT NOT NULL,
+    PRIMARY KEY (video_id, requested)
+);
+CREATE INDEX IF NOT EXISTS transcripts_accessed ON transcripts (accessed);
+"""
+
+
+def pack_segments(segments: list[tuple[float, float, str]]) -> bytes:
+    """Columnar JSON (starts, durations, texts) compresses far better than row dicts."""
+    columns = {
+        "start": [s[0] for s in segments],
+        "duration": [s[1] for s in segments],
+        "text": [s[2] for s in segments],
+    }
+    return zlib.compress(json.dumps(columns, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def unpack_segments(payload: bytes) -> list[tuple[float, float, str]]:
+    columns = json.loads(zlib.decompress(payload).decode("utf-8"))
+    return list(zip(columns["start"], columns["duration"], columns["text"]))
+
+
+class TranscriptCache:
+    """Size-capped LRU cache of transcript segments. Safe to share between threads."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(Path(cache_dir) / "transcripts.db"), timeout=30, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def get(self, video_id: str, language: Optional[str] = None) -> Optional[dict]:
+        """Return {'language', 'is_generated', 'segments'} or None on a miss."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT t.language, t.is_generated, t.payload FROM aliases a "
+                "JOIN transcripts t ON t.video_id = a.video_id AND t.language = a.language "
+                "WHERE a.video_id = ? AND a.requested = ?",
+                (video_id, language or "")
+            ).fetchone()
+            if not row:
+                return None
+            self._db.execute(
+                "UPDATE transcripts SET accessed = ? WHERE video_id = ? AND language = ?",
+                (time.time(), video_id, row[0])
+            )
+            self._db.commit()
+        return {"language": row[0], "is_generated": bool(row[1]), "segments": unpack_segments(row[2])}
+
+    def put(self, video_id: str, requested: Optional[str], language: str, is_generated: bool,
+            segments: list[tuple[float, float, str]]):
+        payload = pack_segments(segments)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?)",
+                (video_id, language, int(is_generated), payload, len(payload), time.time())
+            )
+            keys = {requested or "", language}
+            if language == "en":
+                # English exists, so a request without --language resolves here too
+                keys.add("")
+            for key in keys:
+                self._db.execute("INSERT OR REPLACE INTO aliases VALUES (?, ?, ?)", (video_id, key, language))
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for video_id, language, size in self._db.execute(
+            "SELECT video_id, language, size FROM transcripts ORDER BY accessed"
+        ).fetchall():
+            self._db.execute("DELETE FROM transcripts WHERE video_id = ? AND language = ?", (video_id, language))
+            self._db.execute("DELETE FROM aliases WHERE video_id = ? AND language = ?", (video_id, language))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def peek_many(self, video_ids: list[str], language: Optional[str] = None) -> dict:
+        """Bulk read-only lookup: {video_id: segments} for hits, without touching LRU order."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(video_ids), 500):
+                batch = video_ids[start:start + 500]
+                rows = self._db.execute(
+                    "SELECT a.video_id, t.payload FROM aliases a "
+                    "JOIN transcripts t ON t.video_id = a.video_id AND t.language = a.language "
+                    f"WHERE a.requested = ? AND a.video_id IN ({','.join('?' * len(batch))})",
+                    (language or "", *batch)
+                ).fetchall()
+                found.update(rows)
+        return {video_id: unpack_segments(payload) for video_id, payload in found.items()}
+
+    def entries(self):
+        """Yield (video_id, language, is_generated, segments) for every cached transcript."""
+        with self._lock:
+            rows = self._db.execute("SELECT video_id, language, is_generated, payload FROM transcripts").fetchall()
+        for video_id, language, is_generated, payload in rows:
+            yield video_id, language, bool(is_generated), unpack_segments(payload)
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts").fetchone()
+        return {"entries": count, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM transcripts")
+            self._db.execute("DELETE FROM aliases")
+            self._db.commit()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("stats", "clear"):
+        print("Usage: python transcript_cache.py stats|clear")
+        sys.exit(1)
+
+    cache = TranscriptCache()
+    if sys.argv[1] == "clear":
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
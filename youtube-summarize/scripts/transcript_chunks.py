@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Split a transcript into token-budgeted chunks for map-reduce summarization.
+
+Chunks end at sentence ends or speech pauses where possible, and each one
+carries its time range and character span in the transcript's `text`.
+An offset index (segment start offsets + start times) maps any quote back to
+a timestamp by binary search.
+
+Usage:
+    python transcript_chunks.py <video_url_or_id> [--max-tokens 1500] [--pause 1.5]
+                                [--language LANG] [--no-cache]
+    python transcript_chunks.py <video_url_or_id> --quote "exact words from the text"
+"""
+
+import argparse
+import json
+import os
+import sys
+from bisect import bisect_right
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from youtube_transcript import extract_video_id, get_transcript
+from transcript_cache import TranscriptCache
+
+# Rough English average; good enough for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+SENTENCE_ENDINGS = ('.', '?', '!', '…')
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def timestamp_url(video_id: str, seconds: float) -> str:
+    return f"https://youtube.com/watch?v={video_id}&t={int(seconds)}s"
+
+
+class OffsetIndex:
+    """Maps character offsets in a transcript's `text` to segment start times."""
+
+    def __init__(self, segments: list[dict]):
+        # `text` is the segments joined by single spaces
+        self.offsets: list[int] = []
+        self.starts: list[float] = []
+        offset = 0
+        for seg in segments:
+            self.offsets.append(offset)
+            self.starts.append(seg["start"])
+            offset += len(seg["text"]) + 1
+
+    def timestamp(self, char_offset: int) -> float:
+        i = bisect_right(self.offsets, char_offset) - 1
+        return self.starts[max(i, 0)] if self.starts else 0.0
+
+    def locate(self, text: str, quote: str) -> Optional[tuple[int, float]]:
+        """Find a quote in the transcript text; returns (offset, start seconds)."""
+        pos = text.find(quote)
+        if pos < 0:
+            pos = text.lower().find(quote.lower())
+        if pos < 0:
+            return None
+        return pos, self.timestamp(pos)
+
+    def to_dict(self) -> dict:
+        return {"offsets": self.offsets, "starts": self.starts}
+
+
+def chunk_transcript(result: dict, max_tokens: int = 1500, pause: float = 1.5) -> list[dict]:
+    """
+    Split a get_transcript() result into chunks of at most ~max_tokens.
+
+    A chunk may end after a segment that closes a sentence or is followed by a
+    gap of at least `pause` seconds. If no such boundary fits in the budget,
+    the chunk is cut at the last segment that does. A single segment is never split.
+    """
+    segments = result.get("segments") or []
+    text = result.get("text", "")
+    video_id = result.get("video_id")
+    index = OffsetIndex(segments)
+    max_chars = max_tokens * CHARS_PER_TOKEN
+
+    def span_end(i: int) -> int:
+        return index.offsets[i] + len(segments[i]["text"])
+
+    def make_chunk(first: int, last: int) -> dict:
+        char_start, char_end = index.offsets[first], span_end(last)
+        chunk_text = text[char_start:char_end]
+        start = segments[first]["start"]
+        return {
+            "index": 0,
+            "start": start,
+            "end": segments[last]["start"] + segments[last]["duration"],
+            "char_start": char_start,
+            "char_end": char_end,
+            "tokens": estimate_tokens(chunk_text),
+            "url": timestamp_url(video_id, start) if video_id else None,
+            "text": chunk_text,
+        }
+
+    chunks = []
+    first = 0
+    boundary = None
+    for i, seg in enumerate(segments):
+        while i > first and span_end(i) - index.offsets[first] > max_chars:
+            cut = boundary if boundary is not None else i - 1
+            chunks.append(make_chunk(first, cut))
+            first = cut + 1
+            boundary = None
+
+        nxt = segments[i + 1] if i + 1 < len(segments) else None
+        gap = nxt["start"] - (seg["start"] + seg["duration"]) if nxt else 0
+        if seg["text"].rstrip().endswith(SENTENCE_ENDINGS) or gap >= pause:
+            boundary = i
+
+    if segments and first < len(segments):
+        chunks.append(make_chunk(first, len(segments) - 1))
+    for n, chunk in enumerate(chunks):
+        chunk["index"] = n
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunk a YouTube transcript for map-reduce summarization")
+    parser.add_argument("video", help="Video URL or ID")
+    parser.add_argument("--max-tokens", type=int, default=1500, help="Approximate token budget per chunk")
+    parser.add_argument("--pause", type=float, default=1.5, help="Gap in seconds treated as a boundary")
+    parser.add_argument("--quote", help="Map a quote from the transcript to a timestamp link")
+    parser.add_argument("--language", help="Preferred transcript language")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the transcript cache")
+    args = parser.parse_args()
+
+    try:
+        video_id = extract_video_id(args.video)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+    cache = None if args.no_cache else TranscriptCache()
+    result = get_transcript(video_id, args.language, cache)
+    if "error" in result:
+        print(json.dumps(result))
+        sys.exit(1)
+
+    index = OffsetIndex(result["segments"])
+    if args.quote:
+        found = index.locate(result["text"], args.quote)
+        if not found:
+            print(json.dumps({"quote": args.quote, "error": "Quote not found"}))
+            sys.exit(1)
+        offset, start = found
+        print(json.dumps({"quote": args.quote, "offset": offset, "start": start,
+                          "url": timestamp_url(video_id, start)}, ensure_ascii=False))
+        return
+
+    print(json.dumps({
+        "video_id": video_id,
+        "language": result["language"],
+        "duration_seconds": result["duration_seconds"],
+        "chunks": chunk_transcript(result, args.max_tokens, args.pause),
+        "index": index.to_dict(),
+    }, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
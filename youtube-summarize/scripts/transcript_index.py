@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Full-text index over fetched transcripts (SQLite FTS5).
+
+Every segment is indexed with its video and start time, so keyword and
+phrase queries return (video, timestamp, snippet) hits across the whole
+watchlist history without refetching or rereading transcripts. The index is
+filled incrementally by youtube_transcript.py / batch_transcripts.py as
+transcripts are fetched; `sync` backfills anything already in the cache.
+
+Usage:
+    python transcript_index.py search "query" [--phrase] [--days 7] [--channel NAME] [--limit 20]
+    python transcript_index.py sync
+    python transcript_index.py stats
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from transcript_cache import TranscriptCache
+
+DEFAULT_INDEX_PATH = Path(os.environ.get(
+    "YT_TRANSCRIPT_INDEX",
+    os.path.expanduser("~/.openclaw/workspace/data/youtube-transcripts.db")
+))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    language TEXT,
+    title TEXT,
+    channel TEXT,
+    published TEXT,
+    indexed_at TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+    text,
+    video_id UNINDEXED,
+    start UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def _utc_iso(value: Optional[str]) -> Optional[str]:
+    """Normalise an ISO timestamp to naive UTC so string comparison orders correctly."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _match_expression(query: str, phrase: bool) -> str:
+    """Quote user input so punctuation can't break FTS5 syntax; words are ANDed."""
+    if phrase:
+        return '"' + query.replace('"', '""') + '"'
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+class TranscriptIndex:
+    """Segment-level FTS index. Safe to share between threads."""
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def has(self, video_id: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM videos WHERE video_id = ?", (video_id,)).fetchone() is not None
+
+    def add(self, video_id: str, language: str, segments, title: str = None,
+            channel: str = None, published: str = None):
+        """
+        Index a transcript's (start, duration, text) tuples or segment dicts.
+        Already-indexed videos only get their metadata filled in.
+        """
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        with self._lock:
+            exists = self._db.execute("SELECT 1 FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+            if exists:
+                self._db.execute(
+                    "UPDATE videos SET title = COALESCE(?, title), channel = COALESCE(?, channel), "
+                    "published = COALESCE(?, published) WHERE video_id = ?",
+                    (title, channel, _utc_iso(published), video_id)
+                )
+            else:
+                self._db.execute(
+                    "INSERT INTO videos VALUES (?, ?, ?, ?, ?, ?)",
+                    (video_id, language, title, channel, _utc_iso(published), now)
+                )
+                rows = (
+                    (seg["text"], video_id, seg["start"]) if isinstance(seg, dict) else (seg[2], video_id, seg[0])
+                    for seg in segments
+                )
+                self._db.executemany("INSERT INTO segments (text, video_id, start) VALUES (?, ?, ?)", rows)
+            self._db.commit()
+
+    def search(self, query: str, phrase: bool = False, days: float = None,
+               channel: str = None, limit: int = 20) -> list[dict]:
+        """
+        Best-ranked matching segments as {video_id, start, url, snippet, title, channel}.
+        Raises ValueError for a query with no words, which FTS5 can't parse.
+        """
+        if not query.strip():
+            raise ValueError("Empty search query")
+        sql = (
+            "SELECT segments.video_id, segments.start, "
+            "snippet(segments, 0, '**', '**', '…', 16), v.title, v.channel "
+            "FROM segments JOIN videos v ON v.video_id = segments.video_id "
+            "WHERE segments MATCH ?"
+        )
+        params: list = [_match_expression(query, phrase)]
+        if days is not None:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
+            sql += " AND COALESCE(v.published, v.indexed_at) >= ?"
+            params.append(cutoff)
+        if channel:
+            sql += " AND v.channel LIKE ?"
+            params.append(f"%{channel}%")
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            {
+                "video_id": video_id,
+                "start": start,
+                "url": f"https://youtube.com/watch?v={video_id}&t={int(start)}s",
+                "snippet": snippet,
+                "title": title,
+                "channel": channel_name,
+            }
+            for video_id, start, snippet, title, channel_name in rows
+        ]
+
+    def sync_from_cache(self, cache: TranscriptCache) -> int:
+        """Index any cached transcripts that are not in the index yet."""
+        # Imported here: youtube_transcript imports this module
+        from youtube_transcript import segments_for_index
+
+        added = 0
+        for video_id, language, is_generated, segments in cache.entries():
+            if not self.has(video_id):
+                self.add(video_id, language, segments_for_index(is_generated, segments))
+                added += 1
+        return added
+
+    def stats(self) -> dict:
+        with self._lock:
+            videos = self._db.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+            segments = self._db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        return {"videos": videos, "segments": segments}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the local transcript index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    search = sub.add_parser("search", help="Keyword or phrase search")
+    search.add_argument("query")
+    search.add_argument("--phrase", action="store_true", help="Match the exact phrase")
+    search.add_argument("--days", type=float, help="Only videos published/indexed in the last N days")
+    search.add_argument("--channel", help="Only channels whose name contains this")
+    search.add_argument("--limit", type=int, default=20)
+    sub.add_parser("sync", help="Index transcripts already in the cache")
+    sub.add_parser("stats", help="Show index size")
+    args = parser.parse_args()
+
+    index = TranscriptIndex()
+    if args.command == "search":
+        try:
+            hits = index.search(args.query, args.phrase, args.days, args.channel, args.limit)
+        except ValueError as e:
+            print(json.dumps({"error": str(e)}))
+            sys.exit(1)
+        print(json.dumps(hits, ensure_ascii=False, indent=2))
+    elif args.command == "sync":
+        added = index.sync_from_cache(TranscriptCache())
+        print(json.dumps({"added": added, **index.stats()}, indent=2))
+    else:
+        print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Resident transcript service on localhost HTTP.
+
+Keeps youtube_transcript_api imported, the disk cache open and recently used
+transcripts in memory, so each request costs milliseconds instead of a cold
+interpreter start. youtube_transcript.py uses it automatically when it is
+running and falls back to in-process fetching when it is not.
+
+Usage:
+    python transcript_service.py [--port 8765] [--memory-entries 64]
+
+Endpoints:
+    GET /health
+    GET /video-id?url=<url_or_id>
+    GET /transcript?v=<video_id>[&language=LANG][&format=json|text|columnar|ndjson][&dedupe=0][&cache=0][&index=0]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from youtube_transcript import (
+    DEFAULT_SERVICE_PORT, SERVICE_HEADER, WRITERS, dedupe_segments, extract_video_id, open_transcript, segments_for_index
+)
+from transcript_cache import TranscriptCache
+from transcript_index import TranscriptIndex
+
+
+class MemoryLRU:
+    """Small in-memory LRU of (meta, segments) in front of the disk cache."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+
+class TranscriptService:
+    def __init__(self, memory_entries: int = 64):
+        self.cache = TranscriptCache()
+        self.index = TranscriptIndex()
+        self.memory = MemoryLRU(memory_entries)
+        # Warm the API import up front instead of on the first request
+        import youtube_transcript_api  # noqa: F401
+
+    def open(self, video_id: str, language: str, use_cache: bool, use_index: bool = True) -> tuple:
+        key = (video_id, language or "")
+        if use_cache:
+            hit = self.memory.get(key)
+            if hit:
+                return hit
+        meta, segments = open_transcript(video_id, language, self.cache if use_cache else None)
+        if segments is None:
+            return meta, None
+        segments = list(segments)
+        self.memory.put(key, (meta, segments))
+        if use_index:
+            self.index.add(video_id, meta["language"], segments_for_index(meta["is_generated"], segments))
+        return meta, segments
+
+
+def make_handler(service: TranscriptService):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, body: str, status: int = 200, content_type: str = "application/json"):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header(SERVICE_HEADER, "1")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            if url.path == "/health":
+                self._send(json.dumps({"ok": True, "pid": os.getpid()}))
+                return
+
+            if url.path == "/video-id":
+                try:
+                    self._send(json.dumps({"video_id": extract_video_id(query.get("url", ""))}))
+                except ValueError as e:
+                    self._send(json.dumps({"error": str(e)}))
+                return
+
+            if url.path != "/transcript":
+                self._send(json.dumps({"error": "Not found"}), 404)
+                return
+
+            output_format = query.get("format", "json")
+            if output_format not in WRITERS:
+                self._send(json.dumps({"error": f"Unknown format: {output_format}"}))
+                return
+            try:
+                video_id = extract_video_id(query.get("v", ""))
+            except ValueError as e:
+                self._send(json.dumps({"error": str(e)}))
+                return
+
+            meta, segments = service.open(video_id, query.get("language"), query.get("cache") != "0",
+                                          query.get("index") != "0")
+            if segments is None:
+                self._send(json.dumps(meta, ensure_ascii=False, indent=2))
+                return
+            stats = None
+            if meta["is_generated"] and query.get("dedupe") != "0":
+                stats = {}
+                segments = dedupe_segments(segments, stats)
+
+            out = io.StringIO()
+            WRITERS[output_format](out, meta, segments, stats)
+            self._send(out.getvalue())
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident YouTube transcript service")
+    parser.add_argument("--port", type=int, default=DEFAULT_SERVICE_PORT, help="Localhost port")
+    parser.add_argument("--memory-entries", type=int, default=64, help="Transcripts kept in memory")
+    args = parser.parse_args()
+
+    service = TranscriptService(args.memory_entries)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(service))
+    print(f"[INFO] Transcript service listening on http://127.0.0.1:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
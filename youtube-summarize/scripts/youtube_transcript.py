@@ -1,43 +1,177 @@
 #!/usr/bin/env python3
 """
 Fetch YouTube video transcripts using youtube-transcript-api.
-Usage: python youtube_transcript.py <video_url_or_id> [--language en]
+Usage: python youtube_transcript.py <video_url_or_id> [--language en] [--no-cache]
+                                    [--format json|text|columnar|ndjson] [--no-dedupe]
+                                    [--no-index] [--no-service]
+
+The text/columnar/ndjson writers stream to stdout as segments are iterated,
+but the whole transcript is still held in memory unless --no-cache and
+--no-index are both given: the cache stores the full list, and the index
+collects the raw segments to add after the output is written.
 """
 
 import sys
 import re
 import json
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import (
-    TranscriptsDisabled,
-    NoTranscriptFound,
-    VideoUnavailable
-)
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from transcript_cache import TranscriptCache
+from transcript_index import TranscriptIndex
+
+# youtube_transcript_api is imported in open_transcript() so cache hits and the
+# service client (transcript_service.py) don't pay for it
+
+DEFAULT_SERVICE_PORT = int(os.environ.get("YT_TRANSCRIPT_SERVICE_PORT", "8765"))
+SERVICE_TIMEOUT = 120
+# Set on every transcript_service.py response, so another server on the port is never trusted
+SERVICE_HEADER = "X-Transcript-Service"
+
+VIDEO_ID_RE = re.compile(r'^[\w-]{11}$')
+URL_PATTERNS = [
+    re.compile(r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/v/)([\w-]{11})'),
+    re.compile(r'youtube\.com/shorts/([\w-]{11})'),
+]
 
 
 def extract_video_id(url_or_id: str) -> str:
     """Extract video ID from YouTube URL or return as-is if already an ID."""
-    if re.match(r'^[\w-]{11}$', url_or_id):
+    if VIDEO_ID_RE.match(url_or_id):
         return url_or_id
     
-    patterns = [
-        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/v/)([\w-]{11})',
-        r'youtube\.com/shorts/([\w-]{11})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url_or_id)
+    for pattern in URL_PATTERNS:
+        match = pattern.search(url_or_id)
         if match:
             return match.group(1)
     
     raise ValueError(f"Could not extract video ID from: {url_or_id}")
 
 
-def get_transcript(video_id: str, language: str = None) -> dict:
+def is_transient(error: Exception) -> bool:
     """
-    Fetch transcript for a video.
-    Returns dict with 'text', 'segments' (with timestamps), 'language'.
+    True for failures a retry can fix: network errors, rate limiting (the
+    library raises IpBlocked on a 429 or a captcha page) and 5xx responses.
+    Anything else (disabled, unavailable, no captions, bad data) won't change.
+    """
+    from requests.exceptions import ConnectionError, HTTPError, Timeout
+    from youtube_transcript_api._errors import IpBlocked, YouTubeRequestFailed
+
+    if isinstance(error, (ConnectionError, Timeout, IpBlocked)):
+        return True
+    if isinstance(error, YouTubeRequestFailed):
+        # Raised while handling the requests HTTPError, which carries the status
+        http_error = error.__context__
+        return (isinstance(http_error, HTTPError) and http_error.response is not None
+                and http_error.response.status_code >= 500)
+    return False
+
+
+# Longest caption overlap (in words) checked at each segment boundary
+MAX_OVERLAP_WORDS = 24
+MIN_OVERLAP_WORDS = 2
+
+
+def _norm_word(word: str) -> str:
+    return word.strip('.,!?;:"\'()[]').lower()
+
+
+def dedupe_segments(segments, stats: dict):
+    """
+    Strip rolling-caption repeats from auto-generated transcripts.
+
+    Auto captions often restate the tail of the previous window at the start
+    of the next ("we went to the store" / "to the store and bought"). For each
+    segment, drop the longest prefix that repeats the last words already emitted,
+    checking at most MAX_OVERLAP_WORDS so the pass stays linear. A repeat needs
+    at least MIN_OVERLAP_WORDS words, so a one-word segment that happens to
+    equal the previous word ("no" / "no") is kept. Segments that are entirely
+    repeated are merged into the previous one by extending its duration, so
+    every kept segment keeps its original start time.
+    Fills stats with before/after counts as the generator is consumed.
     """
+    stats.update(segments_before=0, segments_after=0, words_removed=0, chars_before=0, chars_after=0)
+    tail: list[str] = []
+    pending = None
+    for start, duration, text in segments:
+        stats["segments_before"] += 1
+        stats["chars_before"] += len(text) + 1
+        words = text.split()
+        norm = [_norm_word(w) for w in words]
+
+        overlap = 0
+        for k in range(min(len(tail), len(norm), MAX_OVERLAP_WORDS), MIN_OVERLAP_WORDS - 1, -1):
+            if tail[-k:] == norm[:k]:
+                overlap = k
+                break
+        stats["words_removed"] += overlap
+
+        if overlap == len(words):
+            if pending:
+                end = max(pending[0] + pending[1], start + duration)
+                pending = (pending[0], end - pending[0], pending[2])
+            continue
+
+        tail = (tail + norm[overlap:])[-MAX_OVERLAP_WORDS:]
+        if pending:
+            yield pending
+        pending = (start, duration, ' '.join(words[overlap:]) if overlap else text)
+        stats["segments_after"] += 1
+        stats["chars_after"] += len(pending[2]) + 1
+    if pending:
+        yield pending
+    stats["tokens_saved_est"] = (stats["chars_before"] - stats["chars_after"]) // 4
+
+
+def segments_for_index(is_generated: bool, segments) -> list:
+    """
+    What the full-text index stores for a transcript: auto captions are always
+    deduplicated, so a phrase isn't indexed (and found) once per rolling window.
+    Takes raw (start, duration, text) tuples or segment dicts.
+    """
+    segments = [(s["start"], s["duration"], s["text"]) if isinstance(s, dict) else s for s in segments]
+    return list(dedupe_segments(segments, {})) if is_generated else segments
+
+
+def build_result(video_id: str, language: str, is_generated: bool, segments: list, stats: dict = None) -> dict:
+    """Assemble the output dict from (start, duration, text) segments, with dedup stats if given."""
+    full_text = ' '.join(seg[2] for seg in segments)
+    segments_data = [{"start": start, "duration": duration, "text": text} for start, duration, text in segments]
+    
+    result = {
+        "video_id": video_id,
+        "language": language,
+        "is_generated": is_generated,
+        "text": full_text,
+        "segments": segments_data,
+        "duration_seconds": segments_data[-1]['start'] + segments_data[-1]['duration'] if segments_data else 0
+    }
+    if stats is not None:
+        result["dedup"] = stats
+    return result
+
+
+def open_transcript(video_id: str, language: str = None, cache: TranscriptCache = None) -> tuple:
+    """
+    Resolve and fetch a transcript without building the output dict.
+    Returns (meta, segments) where meta has 'video_id', 'language', 'is_generated'
+    and segments iterates (start, duration, text); on failure returns (error_dict, None),
+    where error_dict has 'error' and 'retryable' (see is_transient).
+    With a cache, hits skip the network and misses are stored for next time.
+    """
+    if cache:
+        cached = cache.get(video_id, language)
+        if cached:
+            meta = {"video_id": video_id, "language": cached["language"], "is_generated": cached["is_generated"]}
+            return meta, cached["segments"]
+    
+    from youtube_transcript_api import YouTubeTranscriptApi
+    from youtube_transcript_api._errors import (
+        TranscriptsDisabled,
+        NoTranscriptFound,
+        VideoUnavailable
+    )
+    
     try:
         api = YouTubeTranscriptApi()
         transcript_list = api.list(video_id)
@@ -63,52 +197,201 @@ def get_transcript(video_id: str, language: str = None) -> dict:
                     break
         
         if not transcript:
-            return {"error": "No transcript available"}
+            return {"error": "No transcript available", "retryable": False}, None
         
-        segments = transcript.fetch()
-        full_text = ' '.join(seg.text for seg in segments)
-        segments_data = [{"start": seg.start, "duration": seg.duration, "text": seg.text} for seg in segments]
+        fetched = transcript.fetch()
+        meta = {"video_id": video_id, "language": used_language, "is_generated": transcript.is_generated}
+        if cache:
+            segments = [(seg.start, seg.duration, seg.text) for seg in fetched]
+            cache.put(video_id, language, used_language, transcript.is_generated, segments)
+            return meta, segments
         
-        return {
-            "video_id": video_id,
-            "language": used_language,
-            "is_generated": transcript.is_generated,
-            "text": full_text,
-            "segments": segments_data,
-            "duration_seconds": segments_data[-1]['start'] + segments_data[-1]['duration'] if segments_data else 0
-        }
+        return meta, ((seg.start, seg.duration, seg.text) for seg in fetched)
         
     except TranscriptsDisabled:
-        return {"error": "Transcripts are disabled for this video"}
+        return {"error": "Transcripts are disabled for this video", "retryable": False}, None
     except VideoUnavailable:
-        return {"error": "Video is unavailable"}
+        return {"error": "Video is unavailable", "retryable": False}, None
     except NoTranscriptFound:
-        return {"error": "No transcript found for this video"}
+        return {"error": "No transcript found for this video", "retryable": False}, None
     except Exception as e:
-        return {"error": str(e)}
+        return {"error": str(e), "retryable": is_transient(e)}, None
+
+
+def get_transcript(video_id: str, language: str = None, cache: TranscriptCache = None,
+                   dedupe: bool = True) -> dict:
+    """
+    Fetch transcript for a video.
+    Returns dict with 'text', 'segments' (with timestamps), 'language'.
+    Auto-generated transcripts are deduplicated unless dedupe=False; the
+    savings are reported under 'dedup'.
+    """
+    meta, segments = open_transcript(video_id, language, cache)
+    if segments is None:
+        return meta
+    stats = None
+    if dedupe and meta["is_generated"]:
+        stats = {}
+        segments = dedupe_segments(segments, stats)
+    segments = list(segments)
+    return build_result(video_id, meta["language"], meta["is_generated"], segments, stats)
+
+
+def _json(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _write_meta(out, meta: dict):
+    out.write('{' + ', '.join(f'{_json(k)}: {_json(v)}' for k, v in meta.items()))
+
+
+def write_text(out, meta: dict, segments, stats: dict = None):
+    """{meta..., "text": "...", "duration_seconds": N} written piece by piece."""
+    _write_meta(out, meta)
+    out.write(', "text": "')
+    end = 0
+    for i, (start, duration, text) in enumerate(segments):
+        out.write((' ' if i else '') + _json(text)[1:-1])
+        end = start + duration
+    out.write(f'", "duration_seconds": {_json(end)}}}\n')
+
+
+def write_columnar(out, meta: dict, segments, stats: dict = None):
+    """{meta..., "start": [...], "duration": [...], "text": [...], "duration_seconds": N}"""
+    segments = segments if isinstance(segments, list) else list(segments)
+    _write_meta(out, meta)
+    for column, key in enumerate(("start", "duration", "text")):
+        out.write(f', "{key}": [')
+        for i, seg in enumerate(segments):
+            out.write((', ' if i else '') + _json(seg[column]))
+        out.write(']')
+    end = segments[-1][0] + segments[-1][1] if segments else 0
+    out.write(f', "duration_seconds": {_json(end)}}}\n')
+
+
+def write_ndjson(out, meta: dict, segments, stats: dict = None):
+    """Meta line, one line per segment as it is iterated, then a duration_seconds line."""
+    out.write(_json(meta) + '\n')
+    end = 0
+    for start, duration, text in segments:
+        out.write(_json({"start": start, "duration": duration, "text": text}) + '\n')
+        end = start + duration
+    out.write(_json({"duration_seconds": end}) + '\n')
+
+
+def write_json(out, meta: dict, segments, stats: dict = None):
+    """The full object, including the dedup stats once the segments have been consumed."""
+    segments = list(segments)
+    result = build_result(meta["video_id"], meta["language"], meta["is_generated"], segments, stats)
+    out.write(json.dumps(result, ensure_ascii=False, indent=2) + '\n')
+
+
+# Each writer takes (out, meta, segments, stats); only json embeds the dedup stats
+WRITERS = {
+    "json": write_json,
+    "text": write_text,
+    "columnar": write_columnar,
+    "ndjson": write_ndjson,
+}
+
+
+def fetch_from_service(video_id: str, language: str = None, output_format: str = "json",
+                       dedupe: bool = True, use_cache: bool = True, use_index: bool = True,
+                       port: int = DEFAULT_SERVICE_PORT):
+    """Ask a running transcript_service.py for the output; None if it isn't reachable."""
+    import http.client
+    from urllib.parse import urlencode
+    
+    params = {"v": video_id, "format": output_format}
+    if language:
+        params["language"] = language
+    if not dedupe:
+        params["dedupe"] = "0"
+    if not use_cache:
+        params["cache"] = "0"
+    if not use_index:
+        params["index"] = "0"
+    
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=SERVICE_TIMEOUT)
+        conn.request("GET", "/transcript?" + urlencode(params))
+        response = conn.getresponse()
+        if response.status != 200 or response.getheader(SERVICE_HEADER) != "1":
+            return None
+        return response.read().decode("utf-8")
+    except OSError:
+        return None
+
+
+def _collect(segments, into: list):
+    for segment in segments:
+        into.append(segment)
+        yield segment
 
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python youtube_transcript.py <video_url_or_id> [--language LANG]")
+        print("Usage: python youtube_transcript.py <video_url_or_id> [--language LANG] [--no-cache] "
+              "[--format json|text|columnar|ndjson] [--no-dedupe] [--no-index] [--no-service]")
         sys.exit(1)
     
     url_or_id = sys.argv[1]
     language = None
+    output_format = "json"
     
     if '--language' in sys.argv:
         idx = sys.argv.index('--language')
         if idx + 1 < len(sys.argv):
             language = sys.argv[idx + 1]
     
+    if '--format' in sys.argv:
+        idx = sys.argv.index('--format')
+        if idx + 1 < len(sys.argv):
+            output_format = sys.argv[idx + 1]
+    if output_format not in WRITERS:
+        print(json.dumps({"error": f"Unknown format: {output_format}"}))
+        sys.exit(1)
+    
     try:
         video_id = extract_video_id(url_or_id)
     except ValueError as e:
         print(json.dumps({"error": str(e)}))
         sys.exit(1)
     
-    result = get_transcript(video_id, language)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if '--no-service' not in sys.argv:
+        body = fetch_from_service(video_id, language, output_format,
+                                  dedupe='--no-dedupe' not in sys.argv, use_cache='--no-cache' not in sys.argv,
+                                  use_index='--no-index' not in sys.argv)
+        if body is not None:
+            sys.stdout.write(body)
+            return
+    
+    cache = None if '--no-cache' in sys.argv else TranscriptCache()
+    meta, segments = open_transcript(video_id, language, cache)
+    if segments is None:
+        print(json.dumps(meta, ensure_ascii=False, indent=2))
+        return
+    
+    # Keep the raw segments as they stream past, so fresh (--no-cache) fetches are indexed too.
+    # This holds the full list; only --no-cache --no-index keeps memory flat.
+    raw_segments = []
+    if '--no-index' not in sys.argv:
+        segments = _collect(segments, raw_segments)
+    stats = None
+    if meta["is_generated"] and '--no-dedupe' not in sys.argv:
+        stats = {}
+        segments = dedupe_segments(segments, stats)
+    WRITERS[output_format](sys.stdout, meta, segments, stats)
+    
+    if '--no-index' not in sys.argv:
+        TranscriptIndex().add(video_id, meta["language"], segments_for_index(meta["is_generated"], raw_segments))
+    
+    if stats:
+        saved = stats["chars_before"] - stats["chars_after"]
+        pct = 100 * saved / stats["chars_before"] if stats["chars_before"] else 0
+        print(f"[INFO] Dedup: {stats['chars_before']} -> {stats['chars_after']} chars (-{pct:.0f}%), "
+              f"{stats['segments_before']} -> {stats['segments_after']} segments, "
+              f"~{stats['tokens_saved_est']} tokens saved", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+import youtube_transcript  # noqa: E402
+from youtube_transcript import dedupe_segments  # noqa: E402
+
+ROLLING = [
+    (0.0, 2.0, "we went to the store"),
+    (2.0, 2.0, "to the store and bought"),
+    (4.0, 1.0, "and bought"),
+    (5.0, 2.0, "some milk"),
+]
+
+
+class FakeIndex:
+    added = []
+
+    def add(self, video_id, language, segments, *args):
+        self.added.append((video_id, list(segments)))
+
+
+@pytest.fixture(autouse=True)
+def fake_index(monkeypatch):
+    FakeIndex.added = []
+    monkeypatch.setattr(youtube_transcript, "TranscriptIndex", FakeIndex)
+    return FakeIndex
+
+
+def run_cli(monkeypatch, capsys, *flags, segments=ROLLING):
+    meta = {"video_id": "dQw4w9WgXcQ", "language": "en", "is_generated": True}
+    monkeypatch.setattr(youtube_transcript, "open_transcript", lambda *args: (meta, iter(segments)))
+    monkeypatch.setattr(sys, "argv", ["youtube_transcript.py", "dQw4w9WgXcQ", "--no-cache", "--no-service", *flags])
+    youtube_transcript.main()
+    return capsys.readouterr().out
+
+
+def test_dedupe_strips_rolling_repeats():
+    stats = {}
+    segments = list(dedupe_segments(ROLLING, stats))
+    assert segments == [(0.0, 2.0, "we went to the store"), (2.0, 3.0, "and bought"), (5.0, 2.0, "some milk")]
+    assert stats["segments_before"] == 4
+    assert stats["segments_after"] == 3
+    assert stats["words_removed"] == 5
+
+
+def test_dedupe_keeps_repeated_single_word():
+    stats = {}
+    segments = list(dedupe_segments([(0.0, 1.0, "no"), (1.0, 1.0, "No."), (2.0, 1.0, "really")], stats))
+    assert [text for _, _, text in segments] == ["no", "No.", "really"]
+    assert stats["words_removed"] == 0
+
+
+def test_cli_json_reports_dedup(monkeypatch, capsys):
+    result = json.loads(run_cli(monkeypatch, capsys))
+    assert result["text"] == "we went to the store and bought some milk"
+    assert result["dedup"]["segments_before"] == 4
+    assert result["dedup"]["segments_after"] == 3
+    assert result["dedup"]["tokens_saved_est"] > 0
+
+
+def test_cli_json_without_dedupe_has_no_stats(monkeypatch, capsys):
+    result = json.loads(run_cli(monkeypatch, capsys, "--no-dedupe"))
+    assert "dedup" not in result
+    assert len(result["segments"]) == 4
+
+
+@pytest.mark.parametrize("flags", [(), ("--no-dedupe",), ("--format", "ndjson")])
+def test_cli_indexes_deduplicated_segments_from_a_fresh_fetch(monkeypatch, capsys, fake_index, flags):
+    run_cli(monkeypatch, capsys, *flags)
+    assert fake_index.added == [("dQw4w9WgXcQ", list(dedupe_segments(ROLLING, {})))]
+
+
+def test_cli_no_index(monkeypatch, capsys, fake_index):
+    run_cli(monkeypatch, capsys, "--no-index")
+    assert fake_index.added == []
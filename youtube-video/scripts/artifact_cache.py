@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for TTS audio and rendered segments.
+
+Artifacts are keyed by a hash of everything that determines them: the text,
+voice and TTS settings for audio, and the audio bytes plus render settings for
+video. Identical segments (the hook and outro phrasing, re-runs after an edit
+elsewhere in the script) are reused across dates. An edited segment gets a
+new key, so it is never served the stale file.
+
+Objects live under the cache directory as plain files and are indexed in a
+small SQLite table. Least-recently-used objects are evicted once the cache
+grows past its size cap.
+
+Each asset directory keeps a manifest (.artifacts.json) of the key its
+{segment_id} file was produced from, so an existing file is only reused
+when its inputs are unchanged.
+
+Usage:
+    python artifact_cache.py stats
+    python artifact_cache.py clear
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "YT_VIDEO_CACHE",
+    os.path.expanduser("~/.openclaw/cache/youtube-video")
+))
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB of audio and segments
+MANIFEST_NAME = ".artifacts.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_accessed ON artifacts (accessed);
+"""
+
+
+def artifact_key(kind: str, **fields) -> str:
+    """Stable hash of an artifact's kind and inputs (JSON-serialisable values)."""
+    blob = json.dumps({"kind": kind, **fields}, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def file_digest(path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: Path, dest: Path):
+    """Hard-link src to dest (free on the same volume), falling back to a copy."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    temp = dest.with_name(dest.name + ".part")
+    temp.unlink(missing_ok=True)
+    try:
+        os.link(src, temp)
+    except OSError:
+        shutil.copyfile(src, temp)
+    os.replace(temp, dest)
+
+
+class ArtifactCache:
+    """Size-capped LRU store of artifact files. Safe to share between threads."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.objects = Path(cache_dir) / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(Path(cache_dir) / "artifacts.db"), timeout=30, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def _path(self, key: str, name: str) -> Path:
+        return self.objects / key[:2] / name
+
+    def fetch(self, key: str, dest) -> bool:
+        """Materialise the artifact for `key` at dest. False on a miss."""
+        with self._lock:
+            row = self._db.execute("SELECT name FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return False
+            path = self._path(key, row[0])
+            if not path.exists():
+                self._db.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                self._db.commit()
+                return False
+            self._db.execute("UPDATE artifacts SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        _link_or_copy(path, Path(dest))
+        return True
+
+    def store(self, key: str, kind: str, src):
+        """Add the file at src under `key`, evicting old artifacts past the size cap."""
+        src = Path(src)
+        name = key + src.suffix
+        path = self._path(key, name)
+        _link_or_copy(src, path)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, name, path.stat().st_size, now, now)
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, name, size in self._db.execute(
+            "SELECT key, name, size FROM artifacts ORDER BY accessed"
+        ).fetchall():
+            self._path(key, name).unlink(missing_ok=True)
+            self._db.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT kind, COUNT(*), COALESCE(SUM(size), 0) FROM artifacts GROUP BY kind"
+            ).fetchall()
+        return {
+            "entries": sum(r[1] for r in rows),
+            "bytes": sum(r[2] for r in rows),
+            "max_bytes": self.max_bytes,
+            "kinds": {kind: {"entries": count, "bytes": size} for kind, count, size in rows},
+        }
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM artifacts")
+            self._db.commit()
+            shutil.rmtree(self.objects, ignore_errors=True)
+            self.objects.mkdir(parents=True, exist_ok=True)
+
+
+def load_manifest(directory) -> dict:
+    """{segment_id: key} for the files in an asset directory."""
+    path = Path(directory) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(directory, manifest: dict):
+    path = Path(directory) / MANIFEST_NAME
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def restore(cache: ArtifactCache, manifest: dict, segment_id: str, key: str, output_path, kind: str) -> str:
+    """
+    Make output_path hold the artifact for `key` without producing it.
+    Returns "current" if the existing file was built from the same inputs,
+    "adopted" if an existing file with no manifest entry (made by hand or
+    before the cache existed) was taken as is and stored under `key`,
+    "cached" if it was restored from the cache, or "" if it has to be produced.
+
+    Only a file recorded under a different key is stale. It is moved aside to
+    <name>.stale, never overwritten in place: it may be a link into the cache.
+    """
+    output_path = Path(output_path)
+    recorded = manifest.get(segment_id)
+    if output_path.exists():
+        if recorded == key:
+            return "current"
+        if recorded is None:
+            cache.store(key, kind, output_path)
+            manifest[segment_id] = key
+            return "adopted"
+    if cache.fetch(key, output_path):
+        manifest[segment_id] = key
+        return "cached"
+    if output_path.exists():
+        os.replace(output_path, output_path.with_name(output_path.name + ".stale"))
+        print(f"[INFO] {output_path.name}: inputs changed, kept the old file as {output_path.name}.stale")
+    manifest.pop(segment_id, None)
+    return ""
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("stats", "clear"):
+        print("Usage: python artifact_cache.py stats|clear")
+        sys.exit(1)
+
+    cache = ArtifactCache()
+    if sys.argv[1] == "clear":
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
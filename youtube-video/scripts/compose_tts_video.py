@@ -3,16 +3,83 @@
 Compose a video from TTS audio segments with title cards.
 Fallback when HeyGen avatars are unavailable.
 Uses FFmpeg to create colored background segments with text overlays.
+
+Segments are encoded concurrently (one ffmpeg per worker, threads split
+between them), then concatenated in script order. Encoded segments go into
+the artifact cache, keyed by their audio and card, so unchanged segments are
+reused on re-runs and across dates.
+
+Cards never change, so by default each one is drawn to a PNG once and encoded
+as a looped still (-tune stillimage, STILL_FPS) instead of running drawtext
+on every frame of a 25 fps color source (--card-mode video).
+
+--single-pass skips segment files altogether: one ffmpeg filter graph draws
+every card, crossfades between them, concatenates the audio and writes both
+the 1080p master and the Telegram rendition in a single encode.
+
+Usage:
+    python compose_tts_video.py [output/daily/YYYY-MM-DD] [--jobs N] [--card-mode still|video]
+    python compose_tts_video.py [output/daily/YYYY-MM-DD] --single-pass [--fps 5] [--transition 0.5]
+    python compose_tts_video.py [output/daily/YYYY-MM-DD] --bench
 """
 
+import argparse
+import ctypes
 import json
 import os
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from artifact_cache import ArtifactCache, artifact_key, file_digest, load_manifest, restore, save_manifest
+from telegram_budget import DEFAULT_BUDGET, check_size, probe_duration, retry_budget, telegram_video_args
+
 FFMPEG = r"C:\Users\yuqin\AppData\Local\Microsoft\WinGet\Packages\Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe\ffmpeg-8.0.1-full_build\bin\ffmpeg.exe"
 
+# Still cards only need enough frames to keep players seeking smoothly
+STILL_FPS = 2
+# Match the mp4 video timescale ffmpeg picks for 25 fps segments, so concat -c copy stays clean
+VIDEO_TIMESCALE = "12800"
+
+# Single-pass mode: frame rate (a few frames per crossfade is enough for cards) and crossfade length in seconds
+SINGLE_PASS_FPS = 5
+TRANSITION = 0.5
+
+# Rough peak memory of one 1080p libx264 encode (frames in flight + lookahead)
+ENCODE_MEMORY = 600 * 1024 * 1024
+
+
+def available_memory():
+    """Free physical memory in bytes, or None if it can't be determined."""
+    if sys.platform == "win32":
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong)] + [
+                (name, ctypes.c_ulonglong) for name in (
+                    "ullTotalPhys", "ullAvailPhys", "ullTotalPageFile", "ullAvailPageFile",
+                    "ullTotalVirtual", "ullAvailVirtual", "ullAvailExtendedVirtual")
+            ]
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+        return None
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def encode_workers(jobs, requested=None):
+    """Concurrent encodes: one per core by default, capped by free memory and job count."""
+    workers = requested or os.cpu_count() or 1
+    memory = available_memory()
+    if memory:
+        workers = min(workers, max(1, memory // ENCODE_MEMORY))
+    return max(1, min(workers, jobs))
+
+
 def get_duration(audio_path):
     """Get audio duration in seconds using ffprobe."""
     ffprobe = FFMPEG.replace("ffmpeg.exe", "ffprobe.exe")
@@ -22,42 +89,47 @@ def get_duration(audio_path):
     )
     return float(result.stdout.strip())
 
-def create_segment_video(audio_path, text, output_path, bg_color="0x1a1a2e"):
-    """Create a video segment with colored background and text overlay."""
-    duration = get_duration(audio_path)
-    
-    # Write text to a temp file to avoid shell escaping issues
-    import tempfile
-    # Wrap text at ~55 chars
-    words = text.split()
+def wrap_text(text, width=55):
+    """Wrap text at ~width chars."""
     lines = []
     current = ""
-    for w in words:
-        if len(current) + len(w) + 1 > 55:
+    for w in text.split():
+        if len(current) + len(w) + 1 > width:
             lines.append(current)
             current = w
         else:
             current = f"{current} {w}".strip()
     if current:
         lines.append(current)
-    wrapped = "\n".join(lines)
-    
-    # Write to temp textfile for drawtext
+    return "\n".join(lines)
+
+def write_textfile(text, output_path):
+    """Write wrapped text to a temp file for drawtext (avoids shell escaping issues); returns (path, escaped)."""
     textfile = output_path + ".txt"
     with open(textfile, "w", encoding="utf-8") as tf:
-        tf.write(wrapped)
-    textfile_escaped = textfile.replace("\\", "/").replace(":", "\\:")
+        tf.write(wrap_text(text))
+    return textfile, textfile.replace("\\", "/").replace(":", "\\:")
+
+def drawtext_filter(textfile_escaped):
+    return f"drawtext=textfile='{textfile_escaped}':fontcolor=white:fontsize=32:x=(w-text_w)/2:y=(h-text_h)/2:font=Arial"
+
+def create_segment_video(audio_path, text, output_path, bg_color="0x1a1a2e", threads=None):
+    """Create a video segment with colored background and text overlay."""
+    duration = get_duration(audio_path)
+    textfile, textfile_escaped = write_textfile(text, output_path)
     
     cmd = [
         FFMPEG, "-y",
         "-f", "lavfi", "-i", f"color=c={bg_color}:s=1920x1080:d={duration}",
         "-i", audio_path,
-        "-vf", f"drawtext=textfile='{textfile_escaped}':fontcolor=white:fontsize=32:x=(w-text_w)/2:y=(h-text_h)/2:font=Arial",
+        "-vf", drawtext_filter(textfile_escaped),
         "-c:v", "libx264", "-preset", "fast", "-crf", "23",
         "-c:a", "aac", "-b:a", "192k",
         "-shortest",
-        output_path
     ]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    cmd.append(output_path)
     
     print(f"[INFO] Creating segment: {os.path.basename(output_path)} ({duration:.1f}s)")
     result = subprocess.run(cmd, capture_output=True, text=True)
@@ -69,6 +141,171 @@ def create_segment_video(audio_path, text, output_path, bg_color="0x1a1a2e"):
         return False
     return True
 
+def render_card(text, image_path, bg_color="0x1a1a2e"):
+    """Draw a title card once, to a 1920x1080 PNG."""
+    textfile, textfile_escaped = write_textfile(text, image_path)
+    cmd = [
+        FFMPEG, "-y",
+        "-f", "lavfi", "-i", f"color=c={bg_color}:s=1920x1080",
+        "-vf", drawtext_filter(textfile_escaped),
+        "-frames:v", "1",
+        image_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if os.path.exists(textfile):
+        os.remove(textfile)
+    if result.returncode != 0:
+        print(f"[ERROR] Card render error: {result.stderr[-500:]}")
+        return False
+    return True
+
+def create_still_segment(audio_path, text, output_path, bg_color="0x1a1a2e", threads=None, fps=STILL_FPS):
+    """
+    Same segment as create_segment_video, from a card rendered once and looped at a low
+    frame rate. Stream layout (1080p yuv420p H.264, AAC, timescale) matches, so segments
+    from both paths concat with -c copy.
+    """
+    duration = get_duration(audio_path)
+    image = os.path.splitext(output_path)[0] + ".png"
+    if not render_card(text, image, bg_color):
+        return False
+    
+    cmd = [
+        FFMPEG, "-y",
+        "-i", image,
+        "-i", audio_path,
+        # Decode the PNG once and repeat the frame (-loop 1 would re-decode it every frame)
+        "-vf", f"loop=loop=-1:size=1,fps={fps},format=yuv420p",
+        "-c:v", "libx264", "-preset", "fast", "-crf", "23", "-tune", "stillimage",
+        "-video_track_timescale", VIDEO_TIMESCALE,
+        "-c:a", "aac", "-b:a", "192k",
+        "-t", f"{duration:.3f}", "-shortest",
+    ]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    cmd.append(output_path)
+    
+    print(f"[INFO] Creating still segment: {os.path.basename(output_path)} ({duration:.1f}s)")
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    os.remove(image)
+    if result.returncode != 0:
+        print(f"[ERROR] FFmpeg error: {result.stderr[-500:]}")
+        return False
+    return True
+
+SEGMENT_ENCODERS = {
+    "still": create_still_segment,
+    "video": create_segment_video,
+}
+
+def card_key(audio_path, text, bg_color, mode):
+    """Cache key of a card segment: the audio bytes plus everything drawn and encoded."""
+    return artifact_key("card", audio=file_digest(audio_path), text=text, bg=bg_color, mode=mode,
+                        fps=STILL_FPS if mode == "still" else 25)
+
+def encode_segments(jobs, workers=None, mode="still"):
+    """
+    Encode (sid, audio, text, output, bg) jobs concurrently.
+    Returns [(sid, output, ok, seconds)] in job order, whatever order they finish in.
+    """
+    encode = SEGMENT_ENCODERS[mode]
+    workers = encode_workers(len(jobs), workers)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"[INFO] Encoding {len(jobs)} segments with {workers} workers x {threads} threads")
+
+    def run(job):
+        sid, audio, text, output, bg = job
+        start = time.perf_counter()
+        ok = encode(audio, text, output, bg, threads)
+        return sid, output, ok, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, jobs))
+
+
+def bench_card_modes(jobs):
+    """Encode every segment both ways, one at a time with all cores, and compare time and size."""
+    print(f"{'segment':<20} {'video':>8} {'still':>8} {'speed-up':>9} {'video KB':>10} {'still KB':>10}")
+    totals = {"video": [0.0, 0], "still": [0.0, 0]}
+    for sid, audio, text, output, bg in jobs:
+        row = {}
+        for mode, encode in SEGMENT_ENCODERS.items():
+            path = output.replace(".mp4", f".{mode}.mp4")
+            start = time.perf_counter()
+            ok = encode(audio, text, path, bg)
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(path) if ok else 0
+            row[mode] = (elapsed, size)
+            totals[mode][0] += elapsed
+            totals[mode][1] += size
+            if ok:
+                os.remove(path)
+        (vt, vs), (st, ss) = row["video"], row["still"]
+        print(f"{sid:<20} {vt:7.2f}s {st:7.2f}s {vt / st if st else 0:8.1f}x {vs / 1024:10.0f} {ss / 1024:10.0f}")
+    (vt, vs), (st, ss) = totals["video"], totals["still"]
+    print(f"{'total':<20} {vt:7.2f}s {st:7.2f}s {vt / st if st else 0:8.1f}x {vs / 1024:10.0f} {ss / 1024:10.0f}")
+
+def compose_single_pass(jobs, final_path, telegram_path, fps=SINGLE_PASS_FPS, transition=TRANSITION,
+                        budget=DEFAULT_BUDGET):
+    """
+    Build the whole video in one ffmpeg run, with no segment files.
+    Each card is drawn once in the graph and held for its audio (plus the transition),
+    cards crossfade over the start of the next segment, the audio is concatenated
+    unchanged, and split outputs feed the 1080p master and the 720p Telegram encode.
+    """
+    durations = [get_duration(audio) for _, audio, _, _, _ in jobs]
+    textfiles = []
+    graph = []
+    cmd = [FFMPEG, "-y"]
+    for i, ((sid, audio, text, output, bg), duration) in enumerate(zip(jobs, durations)):
+        cmd += ["-i", audio]
+        textfile, textfile_escaped = write_textfile(text, output)
+        textfiles.append(textfile)
+        hold = duration + (transition if i < len(jobs) - 1 else 0)
+        graph.append(
+            f"color=c={bg}:s=1920x1080:r={fps},trim=end_frame=1,{drawtext_filter(textfile_escaped)},"
+            f"loop=loop=-1:size=1,fps={fps},trim=duration={hold:.3f}[c{i}]"
+        )
+    
+    video, offset = "c0", 0.0
+    for i in range(1, len(jobs)):
+        offset += durations[i - 1]
+        graph.append(f"[{video}][c{i}]xfade=transition=fade:duration={transition}:offset={offset:.3f}[x{i}]")
+        video = f"x{i}"
+    graph.append(f"[{video}]format=yuv420p,split=2[vhd][vsrc]")
+    graph.append("[vsrc]scale=1280:720[vsd]")
+    graph.append("".join(f"[{i}:a]" for i in range(len(jobs))) + f"concat=n={len(jobs)}:v=0:a=1,asplit=2[ahd][asd]")
+    
+    cmd += [
+        "-filter_complex", ";".join(graph),
+        "-map", "[vhd]", "-map", "[ahd]",
+        "-c:v", "libx264", "-preset", "fast", "-crf", "23", "-tune", "stillimage",
+        "-c:a", "aac", "-b:a", "192k",
+        final_path,
+        "-map", "[vsd]", "-map", "[asd]",
+        *telegram_video_args(sum(durations), budget), "-tune", "stillimage",
+        telegram_path
+    ]
+    
+    print(f"[INFO] Single-pass render: {len(jobs)} cards, {sum(durations):.1f}s at {fps} fps")
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    for textfile in textfiles:
+        if os.path.exists(textfile):
+            os.remove(textfile)
+    if result.returncode != 0:
+        print(f"[ERROR] FFmpeg error: {result.stderr[-500:]}")
+        return False
+    size = check_size(telegram_path, budget)
+    if size > budget:
+        print("[INFO] Re-encoding the Telegram rendition from the master...")
+        return compress_for_telegram(final_path, telegram_path, budget, retry_budget(budget, budget, size))
+    return True
+
+def child_cpu_seconds():
+    """CPU time used by finished child processes (ffmpeg); 0 where the OS doesn't report it."""
+    times = os.times()
+    return times.children_user + times.children_system
+
 def concat_videos(segment_paths, output_path):
     """Concatenate video segments."""
     list_path = output_path.replace(".mp4", "_list.txt")
@@ -90,22 +327,45 @@ def concat_videos(segment_paths, output_path):
         return False
     return True
 
-def compress_for_telegram(input_path, output_path):
-    """Compress to <50MB for Telegram."""
-    cmd = [
-        FFMPEG, "-y",
-        "-i", input_path,
-        "-c:v", "libx264", "-crf", "26",
-        "-vf", "scale=1280:720",
-        "-c:a", "aac", "-b:a", "128k",
-        output_path
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return result.returncode == 0
+def compress_for_telegram(input_path, output_path, budget=DEFAULT_BUDGET, target=None):
+    """Compress to fit Telegram's upload limit: CRF 26 capped by a bitrate computed from the duration."""
+    duration = probe_duration(input_path, FFMPEG)
+    target = target or budget
+    for _ in range(2):
+        cmd = [
+            FFMPEG, "-y",
+            "-i", input_path,
+            "-vf", "scale=1280:720",
+            *telegram_video_args(duration, target),
+            output_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"[ERROR] FFmpeg error: {result.stderr[-500:]}")
+            return False
+        size = check_size(output_path, budget)
+        if size <= budget:
+            return True
+        # Rate control missed; one corrective pass scaled by the overshoot
+        target = retry_budget(budget, target, size)
+    print("[ERROR] Could not fit the Telegram budget")
+    return False
 
 def main():
-    date_dir = sys.argv[1] if len(sys.argv) > 1 else "output/daily/2026-02-17"
-    base = Path(os.path.expanduser("~/.openclaw/workspace")) / date_dir
+    parser = argparse.ArgumentParser(description="Compose a title-card video from TTS segments")
+    parser.add_argument("date_dir", nargs="?", default="output/daily/2026-02-17", help="Day directory in the workspace")
+    parser.add_argument("--jobs", type=int, help="Concurrent segment encodes (default: cores, memory permitting)")
+    parser.add_argument("--card-mode", choices=sorted(SEGMENT_ENCODERS), default="still",
+                        help="still: render each card once and loop it; video: drawtext on every frame")
+    parser.add_argument("--single-pass", action="store_true",
+                        help="One filter graph for all cards and both outputs, no segment files")
+    parser.add_argument("--fps", type=float, default=SINGLE_PASS_FPS, help="Single-pass frame rate")
+    parser.add_argument("--transition", type=float, default=TRANSITION, help="Single-pass crossfade seconds")
+    parser.add_argument("--telegram-mb", type=float, default=DEFAULT_BUDGET / (1024*1024),
+                        help="Size budget for final-telegram.mp4 (Telegram's limit is 50 MB)")
+    parser.add_argument("--bench", action="store_true", help="Compare card modes per segment and exit")
+    args = parser.parse_args()
+    base = Path(os.path.expanduser("~/.openclaw/workspace")) / args.date_dir
     
     script_path = base / "script.json"
     audio_dir = base / "assets" / "audio"
@@ -125,38 +385,78 @@ def main():
         "outro": "0x16213e",
     }
     
-    segment_videos = []
+    jobs = []
     for seg in script["avatar_segments"]:
         sid = seg["id"]
         audio = audio_dir / f"{sid}.mp3"
         if not audio.exists():
             print(f"[SKIP] No audio for {sid}")
             continue
-        
-        vid = temp_dir / f"{sid}.mp4"
-        bg = colors.get(sid, "0x1a1a2e")
-        if create_segment_video(str(audio), seg["text"], str(vid), bg):
-            segment_videos.append(str(vid))
+        jobs.append((sid, str(audio), seg["text"], str(temp_dir / f"{sid}.mp4"), colors.get(sid, "0x1a1a2e")))
     
-    if not segment_videos:
+    if args.bench:
+        bench_card_modes(jobs)
+        return
+    
+    if not jobs:
         print("[ERROR] No segments created")
         sys.exit(1)
     
-    # Concat
     final = base / "final-1080p.mp4"
-    print(f"\n[INFO] Concatenating {len(segment_videos)} segments...")
-    if not concat_videos(segment_videos, str(final)):
-        sys.exit(1)
-    
-    # Compress for Telegram
     telegram = base / "final-telegram.mp4"
-    print("[INFO] Compressing for Telegram...")
-    if compress_for_telegram(str(final), str(telegram)):
-        size_mb = os.path.getsize(str(telegram)) / (1024*1024)
-        print(f"\n[SUCCESS] Final video: {telegram} ({size_mb:.1f} MB)")
+    budget = int(args.telegram_mb * 1024 * 1024)
+    start = time.perf_counter()
+    
+    if args.single_pass:
+        if not compose_single_pass(jobs, str(final), str(telegram), args.fps, args.transition, budget):
+            sys.exit(1)
+        temp_bytes = 0
     else:
-        print("[ERROR] Compression failed")
-        sys.exit(1)
+        # Reuse segments built from the same audio and card, from this day or any other
+        cache = ArtifactCache()
+        manifest = load_manifest(temp_dir)
+        keys, pending = {}, []
+        for job in jobs:
+            sid, audio, text, output, bg = job
+            keys[sid] = card_key(audio, text, bg, args.card_mode)
+            status = restore(cache, manifest, sid, keys[sid], output, "card")
+            if status:
+                print(f"[SKIP] Segment {status}: {sid}")
+            else:
+                pending.append(job)
+        
+        results = encode_segments(pending, args.jobs, args.card_mode) if pending else []
+        wall = time.perf_counter() - start
+        for sid, output, ok, seconds in results:
+            print(f"  {sid:<20} {seconds:6.1f}s  {'ok' if ok else 'FAILED'}")
+            if ok:
+                cache.store(keys[sid], "card", output)
+                manifest[sid] = keys[sid]
+        save_manifest(temp_dir, manifest)
+        print(f"[INFO] {len(results)} segments encoded in {wall:.1f}s wall, {sum(r[3] for r in results):.1f}s summed")
+        segment_videos = [output for sid, _, _, output, _ in jobs if manifest.get(sid) == keys[sid]]
+        
+        if not segment_videos:
+            print("[ERROR] No segments created")
+            sys.exit(1)
+        temp_bytes = sum(os.path.getsize(v) for v in segment_videos)
+        
+        # Concat
+        print(f"\n[INFO] Concatenating {len(segment_videos)} segments...")
+        if not concat_videos(segment_videos, str(final)):
+            sys.exit(1)
+        
+        # Compress for Telegram
+        print("[INFO] Compressing for Telegram...")
+        if not compress_for_telegram(str(final), str(telegram), budget):
+            print("[ERROR] Compression failed")
+            sys.exit(1)
+    
+    cpu = child_cpu_seconds()
+    print(f"[INFO] {time.perf_counter() - start:.1f}s wall" + (f", {cpu:.1f}s ffmpeg CPU" if cpu else "") +
+          f", {temp_bytes / (1024*1024):.1f} MB intermediate files")
+    size_mb = os.path.getsize(str(telegram)) / (1024*1024)
+    print(f"\n[SUCCESS] Final video: {telegram} ({size_mb:.1f} MB)")
 
 if __name__ == "__main__":
     main()
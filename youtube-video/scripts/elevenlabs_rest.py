@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Minimal ElevenLabs text-to-speech client with bounded concurrency.
+
+Requests go straight to the REST API, at most `concurrency` at a time (the
+plan's concurrent-request limit). Each one is retried with exponential
+backoff on 429, 5xx and connection errors, honouring Retry-After. Audio is
+written to a temporary file and renamed, so an interrupted request never
+leaves a truncated mp3 behind.
+
+ELEVENLABS_BASE_URL points the client somewhere else, e.g. tts_stub_server.py.
+
+Usage:
+    python elevenlabs_rest.py "Text to speak" out.mp3 [--voice ID]
+
+Requirements:
+    pip install requests
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    print("ERROR: requests not installed. Run: pip install requests", file=sys.stderr)
+    sys.exit(1)
+
+DEFAULT_BASE_URL = "https://api.elevenlabs.io"
+DEFAULT_MODEL = os.environ.get("ELEVENLABS_MODEL_ID", "eleven_multilingual_v2")
+OUTPUT_FORMAT = "mp3_44100_128"
+# One script's worth of segments; plans with a lower limit just see 429s, which are retried
+DEFAULT_CONCURRENCY = int(os.environ.get("ELEVENLABS_CONCURRENCY", "6"))
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+REQUEST_TIMEOUT = (10, 120)
+RETRY_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class TTSError(Exception):
+    """Synthesis failed for good: a non-retryable response or retries exhausted."""
+
+
+def retry_after(response) -> float:
+    """Seconds from a Retry-After header, or None (HTTP-date values are ignored)."""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+class ElevenLabsTTS:
+    """Async text-to-speech over the ElevenLabs REST API with an in-flight limit."""
+
+    def __init__(self, api_key: str, voice_id: str, model_id: str = DEFAULT_MODEL, base_url: str = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, max_attempts: int = MAX_ATTEMPTS):
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.base_url = (base_url or os.environ.get("ELEVENLABS_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max_attempts
+        self._slots = asyncio.Semaphore(self.concurrency)
+        # Own pool: the loop's default executor has only cores + 4 threads
+        self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="tts")
+        self._local = threading.local()
+        self._api_key = api_key
+
+    def _session(self) -> requests.Session:
+        # One pooled session per worker thread; Session isn't documented as thread-safe
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount(self.base_url, HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.headers.update({"xi-api-key": self._api_key, "Accept": "audio/mpeg"})
+            self._local.session = session
+        return session
+
+    def _request(self, text: str, output_path: Path):
+        """One synthesis attempt. Returns None on success, else (retryable, delay hint, message)."""
+        url = f"{self.base_url}/v1/text-to-speech/{self.voice_id}"
+        temp = output_path.with_name(output_path.name + ".part")
+        try:
+            with self._session().post(url, params={"output_format": OUTPUT_FORMAT},
+                                      json={"text": text, "model_id": self.model_id},
+                                      stream=True, timeout=REQUEST_TIMEOUT) as response:
+                if response.status_code != 200:
+                    return (response.status_code in RETRY_STATUS, retry_after(response),
+                            f"HTTP {response.status_code}: {response.text[:200]}")
+                with open(temp, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+        except requests.RequestException as e:
+            temp.unlink(missing_ok=True)
+            return True, None, str(e)
+        if temp.stat().st_size == 0:
+            temp.unlink()
+            return True, None, "empty response"
+        os.replace(temp, output_path)
+        return None
+
+    async def synthesize(self, text: str, output_path, label: str = None):
+        """Write speech for `text` to output_path, retrying transient failures. Raises TTSError."""
+        output_path = Path(output_path)
+        label = label or output_path.stem
+        for attempt in range(1, self.max_attempts + 1):
+            async with self._slots:
+                failure = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, self._request, text, output_path)
+            if failure is None:
+                return
+            retryable, delay, message = failure
+            if not retryable or attempt == self.max_attempts:
+                raise TTSError(f"{message} (attempt {attempt}/{self.max_attempts})")
+            # Full jitter keeps retries from a burst of 429s from arriving together
+            delay = delay if delay is not None else random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+            print(f"[WARN] TTS {label}: {message}; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesize one clip with ElevenLabs")
+    parser.add_argument("text")
+    parser.add_argument("output")
+    parser.add_argument("--voice", default="EXAVITQu4vr4xnSDxMaL", help="Voice ID (default: Sarah)")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    args = parser.parse_args()
+
+    api_key = os.environ.get("ELEVENLABS_API_KEY")
+    if not api_key:
+        print("[ERROR] ELEVENLABS_API_KEY not set")
+        sys.exit(1)
+
+    client = ElevenLabsTTS(api_key, args.voice, args.model)
+    start = time.perf_counter()
+    try:
+        asyncio.run(client.synthesize(args.text, args.output))
+    except TTSError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    print(f"[INFO] Wrote {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
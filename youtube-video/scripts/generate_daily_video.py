@@ -10,8 +10,13 @@ Orchestrates the full pipeline:
 5. Composite final video
 6. Compress for Telegram
 
+Steps 3-6 run as a per-segment graph (segment_dag.py): a segment's avatar render
+starts as soon as its own audio exists, each download is conformed while the next
+renders, and the final output waits for all of them. --phased runs them as
+strict phases instead.
+
 Usage:
-    python generate_daily_video.py [--date YYYY-MM-DD] [--skip-heygen] [--skip-tts]
+    python generate_daily_video.py [--date YYYY-MM-DD] [--skip-heygen] [--skip-tts] [--phased]
 """
 
 import argparse
@@ -20,12 +25,23 @@ import json
 import os
 import subprocess
 import sys
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-# Add insights-video-pipeline to path for ElevenLabs client
-PIPELINE_DIR = Path(r"C:\Users\yuqin\projects\insights-video-pipeline")
-sys.path.insert(0, str(PIPELINE_DIR))
+# Digest history store lives with the youtube-digest skill
+DIGEST_SCRIPTS = Path(__file__).resolve().parents[2] / "youtube-digest" / "scripts"
+sys.path.insert(0, str(DIGEST_SCRIPTS))
+from digest_history import DigestHistory
+from artifact_cache import ArtifactCache, artifact_key, load_manifest, restore, save_manifest
+from elevenlabs_rest import DEFAULT_CONCURRENCY, OUTPUT_FORMAT as TTS_FORMAT, ElevenLabsTTS, TTSError
+from normalize_segments import normalize_segments, verify_decode
+from compose_tts_video import encode_workers
+from segment_dag import SegmentDag
+from telegram_budget import DEFAULT_BUDGET, check_size, probe_duration, retry_budget, telegram_video_args
+
+# ElevenLabs voice (Sarah); voice, model and format are part of the TTS cache key
+TTS_VOICE_ID = "EXAVITQu4vr4xnSDxMaL"
 
 
 def get_output_dir(date_str: str) -> Path:
@@ -37,55 +53,31 @@ def get_output_dir(date_str: str) -> Path:
 def load_digest_history(hours: int = 24) -> list:
     """Load digest history from the last N hours."""
     workspace = Path(os.path.expanduser("~/.openclaw/workspace"))
-    history_file = workspace / "data" / "youtube-digest-history.json"
+    history = DigestHistory(workspace / "data")
     
-    if not history_file.exists():
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    recent = history.digests(since)
+    if not recent:
         print("[ERROR] No digest history found")
-        return []
-        
-    with open(history_file) as f:
-        history = json.load(f)
-        
-    cutoff = datetime.now() - timedelta(hours=hours)
-    recent = []
-    
-    for entry in history.get("digests", []):
-        try:
-            entry_time = datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00"))
-            if entry_time.replace(tzinfo=None) > cutoff:
-                recent.append(entry)
-        except:
-            continue
-            
     return recent
 
 
 def identify_themes(digests: list) -> list:
-    """Identify top themes from digests (placeholder - would use Claude)."""
-    # This is a placeholder - the actual theme identification
-    # would be done by the agent using Claude
-    videos = []
-    for digest in digests:
-        for video in digest.get("videos", []):
-            videos.append({
-                "videoId": video.get("videoId"),
-                "title": video.get("title"),
-                "channel": video.get("channel")
-            })
-    
-    # Return placeholder themes
-    return [
-        {
-            "name": "AI Development",
-            "description": "Latest in AI tools and development",
-            "videos": videos[:3] if len(videos) >= 3 else videos
-        },
-        {
-            "name": "Tech News",
-            "description": "Technology industry updates",
-            "videos": videos[3:6] if len(videos) >= 6 else videos[3:] if len(videos) > 3 else []
-        }
-    ]
+    """
+    Cluster digest videos (plus any cached transcripts) into the top 2 multi-source themes.
+    Returns None if the clustering engine can't load (numpy missing).
+    """
+    try:
+        from theme_clusters import cluster_themes, load_transcripts
+    except ImportError as e:
+        print(f"[ERROR] Theme clustering unavailable: {e}")
+        return None
+    videos = [video for digest in digests for video in digest.get("videos", [])]
+    transcripts = load_transcripts([v.get("videoId") for v in videos if v.get("videoId")])
+    themes = cluster_themes(videos, top=2, min_sources=2, transcripts=transcripts)
+    for theme in themes:
+        print(f"[INFO] Theme: {theme['name']} ({theme['size']} videos, {theme['sources']} channels)")
+    return themes
 
 
 def generate_script(themes: list, output_dir: Path) -> dict:
@@ -123,51 +115,79 @@ def generate_script(themes: list, output_dir: Path) -> dict:
     return script
 
 
-async def generate_tts(script: dict, output_dir: Path) -> bool:
-    """Generate TTS audio for each segment."""
-    try:
-        from src.clients.elevenlabs_client import ElevenLabsClient
-    except ImportError:
-        print("[ERROR] ElevenLabs client not available")
-        return False
+class TTSSession:
+    """One day's ElevenLabs synthesis: client, artifact cache and audio manifest, shared by all segments."""
+    
+    def __init__(self, output_dir: Path, api_key: str, concurrency: int = DEFAULT_CONCURRENCY):
+        self.audio_dir = output_dir / "assets" / "audio"
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self.client = ElevenLabsTTS(api_key, TTS_VOICE_ID, concurrency=concurrency)
+        self.cache = ArtifactCache()
+        self.manifest = load_manifest(self.audio_dir)
         
+    async def segment(self, segment: dict) -> bool:
+        """Synthesize one segment unless its audio is current or cached; recorded as soon as it lands."""
+        output_path = self.audio_dir / f"{segment['id']}.mp3"
+        key = artifact_key("tts", text=segment["text"], voice=TTS_VOICE_ID, model=self.client.model_id,
+                           format=TTS_FORMAT)
+        status = restore(self.cache, self.manifest, segment["id"], key, output_path, "tts")
+        if status:
+            print(f"[SKIP] Audio {status}: {segment['id']}")
+            save_manifest(self.audio_dir, self.manifest)
+            return True
+            
+        try:
+            await self.client.synthesize(segment["text"], output_path, segment["id"])
+        except (TTSError, OSError) as e:
+            print(f"[ERROR] TTS failed for {segment['id']}: {e}")
+            return False
+        self.cache.store(key, "tts", output_path)
+        self.manifest[segment["id"]] = key
+        save_manifest(self.audio_dir, self.manifest)
+        print(f"[INFO] TTS done: {segment['id']}")
+        return True
+
+
+def tts_session(output_dir: Path, concurrency: int = DEFAULT_CONCURRENCY) -> TTSSession:
     api_key = os.environ.get("ELEVENLABS_API_KEY")
     if not api_key:
         print("[ERROR] ELEVENLABS_API_KEY not set")
+        return None
+    return TTSSession(output_dir, api_key, concurrency)
+
+
+async def generate_tts(script: dict, output_dir: Path, concurrency: int = DEFAULT_CONCURRENCY) -> bool:
+    """
+    Generate TTS audio for each segment, up to `concurrency` requests in flight.
+    Each segment retries on its own; finished segments are recorded as they land,
+    so a re-run after a failure only synthesizes what is still missing.
+    """
+    tts = tts_session(output_dir, concurrency)
+    if not tts:
         return False
-        
-    audio_dir = output_dir / "assets" / "audio"
-    audio_dir.mkdir(parents=True, exist_ok=True)
     
-    client = ElevenLabsClient(
-        api_key=api_key,
-        voice_id="EXAVITQu4vr4xnSDxMaL"  # Sarah voice
-    )
-    
-    for segment in script["avatar_segments"]:
-        output_path = audio_dir / f"{segment['id']}.mp3"
-        if output_path.exists():
-            print(f"[SKIP] Audio exists: {segment['id']}")
-            continue
-            
-        print(f"[INFO] Generating TTS: {segment['id']}")
-        try:
-            await client.text_to_speech(segment["text"], str(output_path))
-        except Exception as e:
-            print(f"[ERROR] TTS failed for {segment['id']}: {e}")
-            return False
+    segments = script["avatar_segments"]
+    print(f"[INFO] Generating TTS for {len(segments)} segments, {tts.client.concurrency} at a time...")
+    start = time.perf_counter()
+    done = await asyncio.gather(*(tts.segment(segment) for segment in segments))
+    failed = [segment["id"] for segment, ok in zip(segments, done) if not ok]
+    print(f"[INFO] {len(segments) - len(failed)}/{len(segments)} segments in {time.perf_counter() - start:.1f}s")
+    if failed:
+        print(f"[ERROR] TTS failed for {', '.join(failed)}; re-run to retry just these")
+        return False
             
     print("[INFO] TTS generation complete")
     return True
 
 
-def render_heygen(output_dir: Path) -> bool:
-    """Run HeyGen browser automation script."""
+def render_heygen(output_dir: Path, segment_id: str = None) -> bool:
+    """Run HeyGen browser automation script, for every segment or just `segment_id`."""
     script_path = Path(__file__).parent / "heygen_render.py"
     audio_dir = output_dir / "assets" / "audio"
     avatar_dir = output_dir / "assets" / "avatar"
     
-    if not audio_dir.exists() or not list(audio_dir.glob("*.mp3")):
+    pattern = f"{segment_id}.mp3" if segment_id else "*.mp3"
+    if not audio_dir.exists() or not list(audio_dir.glob(pattern)):
         print("[ERROR] No audio files found for HeyGen")
         return False
         
@@ -176,6 +196,8 @@ def render_heygen(output_dir: Path) -> bool:
         "--audio-dir", str(audio_dir),
         "--output-dir", str(avatar_dir)
     ]
+    if segment_id:
+        cmd += ["--segment", segment_id]
     
     print(f"[INFO] Running HeyGen automation...")
     print(f"[INFO] Command: {' '.join(cmd)}")
@@ -191,17 +213,20 @@ def render_heygen(output_dir: Path) -> bool:
     if results_file.exists():
         with open(results_file) as f:
             results = json.load(f)
-        if results.get("success_count", 0) < results.get("total_count", 1):
+        if segment_id:
+            if not results.get("results", {}).get(segment_id):
+                print(f"[WARN] Segment failed: {segment_id}")
+                return False
+        elif results.get("success_count", 0) < results.get("total_count", 1):
             print(f"[WARN] Some segments failed: {results['success_count']}/{results['total_count']}")
             return False
             
     return True
 
 
-def composite_video(script: dict, output_dir: Path) -> bool:
-    """Composite avatar segments into final video using FFmpeg."""
+def write_concat_list(script: dict, output_dir: Path) -> tuple:
+    """Write the ffmpeg concat list of avatar segments in script order; (list file, segments) or (None, [])."""
     avatar_dir = output_dir / "assets" / "avatar"
-    final_output = output_dir / "final-1080p.mp4"
     
     # Get avatar videos in order
     segment_files = []
@@ -214,13 +239,26 @@ def composite_video(script: dict, output_dir: Path) -> bool:
             
     if not segment_files:
         print("[ERROR] No avatar videos to composite")
-        return False
+        return None, []
         
     # Create concat file
     concat_file = output_dir / "concat.txt"
     with open(concat_file, "w") as f:
         for video in segment_files:
             f.write(f"file '{video}'\n")
+    print(f"[INFO] Compositing {len(segment_files)} segments...")
+    return concat_file, segment_files
+
+
+def composite_video(script: dict, output_dir: Path, final_name: str = "final-1080p.mp4") -> bool:
+    """Composite avatar segments into final video: conform mismatched segments, then concat by stream copy."""
+    final_output = output_dir / final_name
+    concat_file, segment_files = write_concat_list(script, output_dir)
+    if not concat_file:
+        return False
+    if normalize_segments(segment_files):
+        print("[ERROR] Could not conform all segments")
+        return False
             
     # Run FFmpeg concat
     cmd = [
@@ -228,54 +266,236 @@ def composite_video(script: dict, output_dir: Path) -> bool:
         "-f", "concat",
         "-safe", "0",
         "-i", str(concat_file),
-        "-c:v", "libx264",
-        "-preset", "medium",
-        "-crf", "23",
-        "-c:a", "aac",
-        "-b:a", "192k",
+        "-c", "copy",
+        "-movflags", "+faststart",
         str(final_output)
     ]
     
-    print(f"[INFO] Compositing {len(segment_files)} segments...")
     result = subprocess.run(cmd, capture_output=True)
     
     if result.returncode != 0:
         print(f"[ERROR] FFmpeg failed: {result.stderr.decode()}")
         return False
+    if not verify_decode(final_output):
+        return False
         
     print(f"[INFO] Final video: {final_output}")
     return True
 
 
-def compress_for_telegram(output_dir: Path) -> Path:
-    """Compress video for Telegram delivery."""
-    input_file = output_dir / "final-1080p.mp4"
-    output_file = output_dir / "final-telegram.mp4"
-    
-    if not input_file.exists():
-        print("[ERROR] No final video to compress")
+def render_outputs(script: dict, output_dir: Path, final_name: str = "final-1080p.mp4",
+                   telegram_name: str = "final-telegram.mp4", budget: int = DEFAULT_BUDGET) -> Path:
+    """
+    Composite and compress in one pass over the concatenated segments: the 1080p master
+    is a stream copy (segments are normalized first) and only the 720p Telegram
+    rendition is encoded, with the same settings as compress_for_telegram.
+    Returns the Telegram file.
+    """
+    final_output = output_dir / final_name
+    telegram_output = output_dir / telegram_name
+    concat_file, segment_files = write_concat_list(script, output_dir)
+    if not concat_file:
         return None
-        
+    if normalize_segments(segment_files):
+        print("[ERROR] Could not conform all segments")
+        return None
+    duration = sum(probe_duration(str(f)) for f in segment_files)
+    
     cmd = [
         "ffmpeg", "-y",
-        "-i", str(input_file),
-        "-c:v", "libx264",
-        "-crf", "26",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", str(concat_file),
+        "-map", "0:v", "-map", "0:a",
+        "-c", "copy",
+        "-movflags", "+faststart",
+        str(final_output),
+        "-map", "0:v", "-map", "0:a",
         "-vf", "scale=1280:720",
-        "-c:a", "aac",
-        "-b:a", "128k",
-        str(output_file)
+        *telegram_video_args(duration, budget),
+        str(telegram_output)
     ]
     
-    print("[INFO] Compressing for Telegram...")
     result = subprocess.run(cmd, capture_output=True)
     
     if result.returncode != 0:
-        print(f"[ERROR] Compression failed: {result.stderr.decode()}")
+        print(f"[ERROR] FFmpeg failed: {result.stderr.decode()}")
+        return None
+    if not verify_decode(final_output):
         return None
         
-    print(f"[INFO] Telegram video: {output_file}")
-    return output_file
+    print(f"[INFO] Final video: {final_output}")
+    size = check_size(str(telegram_output), budget)
+    if size > budget:
+        print("[INFO] Re-encoding the Telegram rendition from the master...")
+        # The combined render was the first pass, so this is the one corrective pass
+        return compress_for_telegram(output_dir, budget, retry_budget(budget, budget, size),
+                                     final_name, telegram_name, passes=1)
+    print(f"[INFO] Telegram video: {telegram_output}")
+    return telegram_output
+
+
+def _timed(fn, *args):
+    """Run fn, returning (result, wall seconds, child CPU seconds; 0 where the OS doesn't report it)."""
+    before = os.times()
+    start = time.perf_counter()
+    result = fn(*args)
+    after = os.times()
+    cpu = (after.children_user - before.children_user) + (after.children_system - before.children_system)
+    return result, time.perf_counter() - start, cpu
+
+
+def bench_output_stage(script: dict, output_dir: Path):
+    """
+    Time composite + compress (concat, then a decode of the master) against the one-pass output.
+    Both write bench-only files, removed afterwards, so the day's final videos are left alone.
+    """
+    names = {"two-step": ("bench-two-step-1080p.mp4", "bench-two-step-telegram.mp4"),
+             "one-pass": ("bench-one-pass-1080p.mp4", "bench-one-pass-telegram.mp4")}
+    
+    def two_step(final_name, telegram_name):
+        return (composite_video(script, output_dir, final_name)
+                and compress_for_telegram(output_dir, final_name=final_name, telegram_name=telegram_name))
+    
+    try:
+        rows = [
+            ("two-step",) + _timed(two_step, *names["two-step"]),
+            ("one-pass",) + _timed(render_outputs, script, output_dir, *names["one-pass"]),
+        ]
+    finally:
+        for files in names.values():
+            for name in files:
+                (output_dir / name).unlink(missing_ok=True)
+    for name, ok, wall, cpu in rows:
+        print(f"  {name:<10} {wall:7.1f}s wall  {cpu:7.1f}s CPU  {'ok' if ok else 'FAILED'}")
+    if rows[1][2]:
+        print(f"  speed-up   {rows[0][2] / rows[1][2]:.2f}x wall" +
+              (f", {rows[0][3] / rows[1][3]:.2f}x CPU" if rows[1][3] else ""))
+
+
+def compress_for_telegram(output_dir: Path, budget: int = DEFAULT_BUDGET, target: int = None,
+                          final_name: str = "final-1080p.mp4", telegram_name: str = "final-telegram.mp4",
+                          passes: int = 2) -> Path:
+    """
+    Compress video for Telegram delivery, sized to fit `budget` bytes. Each
+    pass after the first retries with the target scaled by the overshoot.
+    """
+    input_file = output_dir / final_name
+    output_file = output_dir / telegram_name
+    
+    if not input_file.exists():
+        print("[ERROR] No final video to compress")
+        return None
+    
+    duration = probe_duration(str(input_file))
+    target = target or budget
+    print("[INFO] Compressing for Telegram...")
+    for _ in range(passes):
+        cmd = [
+            "ffmpeg", "-y",
+            "-i", str(input_file),
+            "-vf", "scale=1280:720",
+            *telegram_video_args(duration, target),
+            str(output_file)
+        ]
+        result = subprocess.run(cmd, capture_output=True)
+        
+        if result.returncode != 0:
+            print(f"[ERROR] Compression failed: {result.stderr.decode()}")
+            return None
+        
+        size = check_size(str(output_file), budget)
+        if size <= budget:
+            print(f"[INFO] Telegram video: {output_file}")
+            return output_file
+        # Rate control missed; one corrective pass scaled by the overshoot
+        target = retry_budget(budget, target, size)
+    
+    print("[ERROR] Could not fit the Telegram budget")
+    return None
+
+
+def produce_outputs(script: dict, output_dir: Path, budget: int = DEFAULT_BUDGET, two_step: bool = False) -> Path:
+    """Final video and Telegram rendition, in one pass or as composite then compress. Returns the Telegram file."""
+    if two_step:
+        # Step 4: Composite video
+        print("\n[PHASE] Video Composition")
+        if not composite_video(script, output_dir):
+            print("[ERROR] Video composition failed")
+            return None
+        
+        # Step 5: Compress for Telegram
+        print("\n[PHASE] Telegram Compression")
+        telegram_video = compress_for_telegram(output_dir, budget)
+        if not telegram_video:
+            print("[ERROR] Compression failed")
+        return telegram_video
+    
+    # Steps 4-5: Composite and compress from one decode
+    print("\n[PHASE] Video Composition + Telegram Rendition")
+    telegram_video = render_outputs(script, output_dir, budget=budget)
+    if not telegram_video:
+        print("[ERROR] Video composition failed")
+    return telegram_video
+
+
+async def run_segment_dag(script: dict, output_dir: Path, args, budget: int = DEFAULT_BUDGET) -> Path:
+    """
+    Run tts -> render -> normalize for every segment as its own chain, fanning in to one
+    output node. Each stage kind has its own concurrency limit. Progress is kept in
+    dag_state.json, so a re-run resumes at the failed nodes. Returns the Telegram file.
+    """
+    audio_dir = output_dir / "assets" / "audio"
+    avatar_dir = output_dir / "assets" / "avatar"
+    segments = script["avatar_segments"]
+    
+    tts = None
+    if not args.skip_tts:
+        tts = tts_session(output_dir, args.tts_concurrency)
+        if not tts:
+            return None
+    
+    dag = SegmentDag(
+        output_dir / "dag_state.json",
+        limits={
+            "tts": args.tts_concurrency,
+            # One at a time: renders share the browser profile and each heygen_render.py
+            # run rewrites the avatar manifest and render_results.json
+            "render": 1,
+            "normalize": encode_workers(len(segments)),
+            "output": 1,
+        },
+        fingerprint=artifact_key("dag", script=script, budget=budget, two_step=args.two_step),
+    )
+    
+    def exists(path):
+        async def check():
+            if not path.exists():
+                print(f"[ERROR] Missing {path}")
+            return path.exists()
+        return check
+    
+    for segment in segments:
+        sid = segment["id"]
+        video = avatar_dir / f"{sid}.mp4"
+        audio = audio_dir / f"{sid}.mp3"
+        dag.add(f"tts:{sid}", "tts",
+                (lambda segment=segment: tts.segment(segment)) if tts else exists(audio), outputs=[audio])
+        dag.add(f"render:{sid}", "render",
+                exists(video) if args.skip_heygen else (lambda sid=sid: asyncio.to_thread(render_heygen, output_dir, sid)),
+                deps=[f"tts:{sid}"], outputs=[video])
+        dag.add(f"normalize:{sid}", "normalize",
+                lambda video=video: asyncio.to_thread(lambda: normalize_segments([video], 1) == 0),
+                deps=[f"render:{sid}"], outputs=[video])
+    dag.add("output", "output",
+            lambda: asyncio.to_thread(lambda: produce_outputs(script, output_dir, budget, args.two_step) is not None),
+            deps=[f"normalize:{segment['id']}" for segment in segments],
+            outputs=[output_dir / "final-1080p.mp4", output_dir / "final-telegram.mp4"])
+    
+    ok = await dag.run()
+    print("\n[INFO] DAG timing:")
+    print(dag.summary())
+    return output_dir / "final-telegram.mp4" if ok else None
 
 
 async def main():
@@ -285,6 +505,16 @@ async def main():
     parser.add_argument("--skip-tts", action="store_true", help="Skip TTS generation")
     parser.add_argument("--themes-json", help="Path to themes JSON (skip theme identification)")
     parser.add_argument("--script-json", help="Path to script JSON (skip script generation)")
+    parser.add_argument("--tts-concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="ElevenLabs requests in flight (your plan's concurrency limit)")
+    parser.add_argument("--phased", action="store_true",
+                        help="Run all TTS, then all renders, then output, instead of the per-segment DAG")
+    parser.add_argument("--two-step", action="store_true",
+                        help="Composite, then encode the Telegram rendition from the master instead of in the same pass")
+    parser.add_argument("--telegram-mb", type=float, default=DEFAULT_BUDGET / (1024 * 1024),
+                        help="Size budget for final-telegram.mp4 (Telegram's limit is 50 MB)")
+    parser.add_argument("--bench-output", action="store_true",
+                        help="Time the two-step and one-pass output stages on existing segments and exit")
     args = parser.parse_args()
     
     output_dir = get_output_dir(args.date)
@@ -312,35 +542,46 @@ async def main():
             print("[ERROR] No recent digests found")
             sys.exit(1)
         themes = identify_themes(digests)
+        if themes is None:
+            sys.exit(1)
+        if not themes:
+            print("[WARN] No theme covered by 2+ channels; skipping today's video")
+            sys.exit(0)
         script = generate_script(themes, output_dir)
     
-    # Step 2: Generate TTS
-    if not args.skip_tts:
-        print("\n[PHASE] TTS Generation")
-        if not await generate_tts(script, output_dir):
-            print("[ERROR] TTS generation failed")
+    budget = int(args.telegram_mb * 1024 * 1024)
+    if not (args.phased or args.bench_output):
+        # Steps 2-5 as a per-segment graph: each segment moves on as soon as its own audio exists
+        print("\n[PHASE] Segment DAG")
+        telegram_video = await run_segment_dag(script, output_dir, args, budget)
+        if not telegram_video:
+            print("[ERROR] Video generation incomplete; re-run to resume from the failed nodes")
             sys.exit(1)
-    
-    # Step 3: Render HeyGen avatars
-    if not args.skip_heygen:
-        print("\n[PHASE] HeyGen Avatar Rendering")
-        if not render_heygen(output_dir):
-            print("[ERROR] HeyGen rendering failed")
+    else:
+        # Step 2: Generate TTS
+        if not args.skip_tts:
+            print("\n[PHASE] TTS Generation")
+            if not await generate_tts(script, output_dir, args.tts_concurrency):
+                print("[ERROR] TTS generation failed")
+                sys.exit(1)
+        
+        # Step 3: Render HeyGen avatars
+        if not args.skip_heygen:
+            print("\n[PHASE] HeyGen Avatar Rendering")
+            if not render_heygen(output_dir):
+                print("[ERROR] HeyGen rendering failed")
+                sys.exit(1)
+        
+        if args.bench_output:
+            print("\n[PHASE] Output Stage Benchmark")
+            bench_output_stage(script, output_dir)
+            return
+        
+        # Steps 4-5: Composite and compress
+        telegram_video = produce_outputs(script, output_dir, budget, args.two_step)
+        if not telegram_video:
             sys.exit(1)
     
-    # Step 4: Composite video
-    print("\n[PHASE] Video Composition")
-    if not composite_video(script, output_dir):
-        print("[ERROR] Video composition failed")
-        sys.exit(1)
-    
-    # Step 5: Compress for Telegram
-    print("\n[PHASE] Telegram Compression")
-    telegram_video = compress_for_telegram(output_dir)
-    if not telegram_video:
-        print("[ERROR] Compression failed")
-        sys.exit(1)
-    
     print(f"\n{'='*60}")
     print("[SUCCESS] Video generation complete!")
     print(f"Final: {output_dir / 'final-1080p.mp4'}")
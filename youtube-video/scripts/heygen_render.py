@@ -25,6 +25,9 @@ from datetime import datetime
 
 import requests
 
+from artifact_cache import ArtifactCache, artifact_key, file_digest, load_manifest, restore, save_manifest
+from normalize_segments import CANONICAL, normalize_segments
+
 # Check for playwright
 try:
     from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
@@ -47,6 +50,10 @@ PAGE_LOAD_TIMEOUT = 30000  # 30s
 RENDER_TIMEOUT = 300000    # 5 min
 GENERATION_TIMEOUT = 300000  # 5 min
 
+# Part of the avatar cache key: change it when the avatar or export settings in HeyGen change
+AVATAR_RENDER = {"service": "heygen", "quality": "1080p"}
+SKIP_LABELS = {"current": "Already exists", "adopted": "Already exists (now cached)", "cached": "From cache"}
+
 
 class HeyGenAutomator:
     def __init__(self, browser_data_dir: str = BROWSER_DATA_DIR, headless: bool = False):
@@ -503,6 +510,38 @@ class HeyGenAutomator:
             return False
 
 
+def avatar_key(audio_path) -> str:
+    """Cache key of an avatar segment: the audio it lip-syncs, render settings and the conform profile."""
+    return artifact_key("avatar", audio=file_digest(audio_path), render=AVATAR_RENDER, profile=CANONICAL)
+
+
+def ingest_segment(output_path, key, cache) -> bool:
+    """Conform a downloaded segment to the canonical profile and add it to the artifact cache."""
+    if normalize_segments([output_path]):
+        return False
+    cache.store(key, "avatar", output_path)
+    return True
+
+
+def save_results(output_dir: Path, results: dict, merge: bool = False) -> Path:
+    """
+    Write render_results.json. With merge (a --segment run) this run's segments are
+    added to the recorded ones instead of replacing the whole file.
+    """
+    results_path = output_dir / "render_results.json"
+    if merge and results_path.exists():
+        with open(results_path) as f:
+            results = {**json.load(f).get("results", {}), **results}
+    with open(results_path, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "results": results,
+            "success_count": sum(1 for v in results.values() if v),
+            "total_count": len(results)
+        }, f, indent=2)
+    return results_path
+
+
 async def main():
     parser = argparse.ArgumentParser(description="HeyGen Browser Automation")
     parser.add_argument("--audio-dir", required=True, help="Directory containing audio files")
@@ -534,6 +573,9 @@ async def main():
     
     # Process each segment
     results = {}
+    conforming = {}
+    cache = ArtifactCache()
+    manifest = load_manifest(output_dir)
     async with HeyGenAutomator(headless=args.headless) as heygen:
         # Check login
         if not await heygen.check_login():
@@ -545,21 +587,38 @@ async def main():
             segment_id = audio_file.stem
             output_path = output_dir / f"{segment_id}.mp4"
             
-            # Skip if already exists
-            if output_path.exists():
-                print(f"[SKIP] Already exists: {output_path}")
+            # Skip if rendered from this audio before (this day or any other)
+            key = avatar_key(audio_file)
+            status = restore(cache, manifest, segment_id, key, output_path, "avatar")
+            if status:
+                print(f"[SKIP] {SKIP_LABELS[status]}: {output_path}")
                 results[segment_id] = str(output_path)
+                if status == "adopted":
+                    # Rendered before the cache existed: may not match the canonical profile yet
+                    conforming[segment_id] = (key, asyncio.create_task(
+                        asyncio.to_thread(ingest_segment, output_path, key, cache)))
                 continue
                 
             success = await heygen.render_segment(str(audio_file), str(output_path))
             if success:
                 results[segment_id] = str(output_path)
+                # Conform to the canonical profile while the next segment renders
+                conforming[segment_id] = (key, asyncio.create_task(
+                    asyncio.to_thread(ingest_segment, output_path, key, cache)))
             else:
                 results[segment_id] = None
                 
             # Brief pause between segments
             await asyncio.sleep(3)
             
+    for segment_id, (key, task) in conforming.items():
+        if await task:
+            manifest[segment_id] = key
+        else:
+            manifest.pop(segment_id, None)
+            results[segment_id] = None
+    save_manifest(output_dir, manifest)
+            
     # Summary
     print(f"\n{'='*60}")
     print("[SUMMARY]")
@@ -573,14 +632,7 @@ async def main():
         print(f"  {status} {segment_id}: {path or 'FAILED'}")
         
     # Write results JSON
-    results_path = output_dir / "render_results.json"
-    with open(results_path, "w") as f:
-        json.dump({
-            "timestamp": datetime.now().isoformat(),
-            "results": results,
-            "success_count": success_count,
-            "total_count": len(results)
-        }, f, indent=2)
+    results_path = save_results(output_dir, results, merge=bool(args.segment))
     print(f"\n[INFO] Results saved to: {results_path}")
     
     sys.exit(0 if success_count == len(results) else 1)
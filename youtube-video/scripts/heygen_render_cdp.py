@@ -5,15 +5,16 @@ HeyGen Browser Automation via CDP - connects to running Chrome instance.
 
 import argparse
 import asyncio
-import json
 import os
 import sys
 import time
 from pathlib import Path
-from datetime import datetime
 
 import requests
 
+from artifact_cache import ArtifactCache, load_manifest, restore, save_manifest
+from heygen_render import avatar_key, ingest_segment, save_results
+
 try:
     from playwright.async_api import async_playwright
 except ImportError:
@@ -306,6 +307,9 @@ async def main():
 
     print(f"[INFO] {len(audio_files)} audio files to process")
     results = {}
+    conforming = {}
+    cache = ArtifactCache()
+    manifest = load_manifest(output_dir)
 
     async with HeyGenCDP() as hg:
         if not await hg.check_login():
@@ -314,22 +318,35 @@ async def main():
         for af in audio_files:
             sid = af.stem
             out = output_dir / f"{sid}.mp4"
-            if out.exists():
-                print(f"[SKIP] {out}")
+            key = avatar_key(af)
+            status = restore(cache, manifest, sid, key, out, "avatar")
+            if status:
+                print(f"[SKIP] {status}: {out}")
                 results[sid] = str(out)
+                if status == "adopted":
+                    conforming[sid] = (key, asyncio.create_task(asyncio.to_thread(ingest_segment, out, key, cache)))
                 continue
 
             ok = await hg.render_segment(str(af), str(out))
             results[sid] = str(out) if ok else None
+            if ok:
+                conforming[sid] = (key, asyncio.create_task(asyncio.to_thread(ingest_segment, out, key, cache)))
             await asyncio.sleep(3)
 
+    for sid, (key, task) in conforming.items():
+        if await task:
+            manifest[sid] = key
+        else:
+            manifest.pop(sid, None)
+            results[sid] = None
+    save_manifest(output_dir, manifest)
+
     sc = sum(1 for v in results.values() if v)
     print(f"\n[SUMMARY] {sc}/{len(results)} succeeded")
     for sid, p in results.items():
         print(f"  {'[OK]' if p else '[FAIL]'} {sid}: {p or 'FAILED'}")
 
-    with open(output_dir / "render_results.json", "w") as f:
-        json.dump({"timestamp": datetime.now().isoformat(), "results": results, "success_count": sc, "total_count": len(results)}, f, indent=2)
+    save_results(output_dir, results, merge=bool(args.segment))
 
     sys.exit(0 if sc == len(results) else 1)
 
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Normalize avatar segments to one canonical encoding profile.
+
+HeyGen downloads don't always agree on frame rate, resolution, pixel format
+or audio sample rate, which is why compositing used to re-encode everything.
+This probes each segment and re-encodes only the ones that differ from
+CANONICAL (audio-only mismatches keep the video stream as is), in place and
+concurrently. Once every segment matches, the final concat is a pure
+stream copy.
+
+A stream copy keeps only the first segment's parameter sets (SPS/PPS, the
+AAC config), so matching fields aren't enough: level, reference frames and
+the rest must agree too. The codec extradata is compared across segments,
+and if it differs every segment that doesn't match the pinned encoder's
+output (a short reference clip) is re-encoded as well. verify_decode()
+checks the finished concat decodes without errors.
+
+heygen_render.py runs it after downloading; generate_daily_video.py runs it
+again before compositing, which is just a probe per segment when nothing
+changed.
+
+Usage:
+    python normalize_segments.py output/daily/YYYY-MM-DD/assets/avatar [--jobs N] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from compose_tts_video import encode_workers
+from telegram_budget import ffprobe_for
+
+# 1080p25 H.264 High + 48 kHz stereo AAC, the profile HeyGen's 1080p export uses
+CANONICAL = {
+    "video": {
+        "codec_name": "h264",
+        "profile": "High",
+        "width": 1920,
+        "height": 1080,
+        "pix_fmt": "yuv420p",
+        "r_frame_rate": "25/1",
+        "sample_aspect_ratio": "1:1",
+        "time_base": "1/12800",
+    },
+    "audio": {
+        "codec_name": "aac",
+        "sample_rate": "48000",
+        "channels": 2,
+    },
+}
+VIDEO_ARGS = [
+    "-vf", "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2,"
+           "setsar=1,fps=25,format=yuv420p",
+    "-c:v", "libx264", "-profile:v", "high", "-preset", "medium", "-crf", "20",
+    # Pinned so every conformed segment gets byte-identical parameter sets
+    "-x264-params", "level=4.0:ref=3:bframes=3:keyint=250:min-keyint=25",
+    # Colour tags end up in the SPS, so set them rather than inherit the source's
+    "-color_range", "tv", "-colorspace", "bt709", "-color_primaries", "bt709", "-color_trc", "bt709",
+    # Same timescale as 25 fps HeyGen segments, so concat -c copy keeps timestamps clean
+    "-video_track_timescale", "12800",
+]
+AUDIO_ARGS = ["-c:a", "aac", "-b:a", "192k", "-ar", "48000", "-ac", "2"]
+
+
+def probe_segment(path, ffmpeg="ffmpeg"):
+    """First video and audio stream of `path` as ffprobe reports them: {"video": {...}, "audio": {...}}."""
+    result = subprocess.run(
+        [ffprobe_for(ffmpeg), "-v", "quiet", "-show_streams", "-show_data_hash", "sha256", "-of", "json", str(path)],
+        capture_output=True, text=True
+    )
+    info = {}
+    for stream in json.loads(result.stdout or "{}").get("streams", []):
+        info.setdefault(stream.get("codec_type"), stream)
+    return info
+
+
+def mismatches(info):
+    """Fields that differ from CANONICAL, as {"video": [...], "audio": [...]}."""
+    found = {}
+    for kind, profile in CANONICAL.items():
+        stream = info.get(kind)
+        if stream is None:
+            found[kind] = ["missing"]
+            continue
+        diff = [f"{key}={stream.get(key)}" for key, value in profile.items()
+                if str(stream.get(key, "")) != str(value)
+                and not (key == "sample_aspect_ratio" and stream.get(key) in (None, "0:1"))]
+        if diff:
+            found[kind] = diff
+    return found
+
+
+def parameter_sets(info):
+    """Extradata hash of the video and audio stream; segments concatenated by copy must agree on both."""
+    return {kind: info.get(kind, {}).get("extradata_hash") for kind in CANONICAL}
+
+
+@lru_cache(maxsize=None)
+def reference_parameter_sets(ffmpeg="ffmpeg"):
+    """Parameter sets conform_segment produces, from a short synthetic clip encoded the same way."""
+    with tempfile.TemporaryDirectory() as temp:
+        clip = Path(temp) / "reference.mp4"
+        result = subprocess.run([
+            ffmpeg, "-y",
+            "-f", "lavfi", "-i", "color=c=black:s=1920x1080:r=25",
+            "-f", "lavfi", "-i", "anullsrc=r=48000:cl=stereo",
+            "-t", "0.2", *VIDEO_ARGS, *AUDIO_ARGS, str(clip)
+        ], capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"reference encode failed: {result.stderr.decode()[-300:]}")
+        return parameter_sets(probe_segment(clip, ffmpeg))
+
+
+def conform_segment(path, video=True, ffmpeg="ffmpeg", threads=None):
+    """
+    Re-encode `path` to CANONICAL in place. With video=False only the audio is
+    re-encoded and the video stream is copied.
+    """
+    path = Path(path)
+    temp = path.with_suffix(".conform.mp4")
+    cmd = [
+        ffmpeg, "-y", "-i", str(path),
+        "-map", "0:v:0", "-map", "0:a:0",
+        *(VIDEO_ARGS if video else ["-c:v", "copy"]),
+        *AUDIO_ARGS,
+    ]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    cmd += ["-movflags", "+faststart", str(temp)]
+
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        print(f"[ERROR] Conforming {path.name} failed: {result.stderr.decode()[-500:]}")
+        temp.unlink(missing_ok=True)
+        return False
+    os.replace(temp, path)
+    return True
+
+
+def normalize_segments(paths, workers=None, ffmpeg="ffmpeg", dry_run=False):
+    """
+    Probe every segment and conform the mismatched ones concurrently.
+    Returns the number of segments that couldn't be conformed (0 on success).
+    """
+    paths = [Path(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=max(1, min(len(paths), 8))) as pool:
+        infos = list(pool.map(lambda p: probe_segment(p, ffmpeg), paths))
+
+    jobs, failed = {}, 0
+    for path, info in zip(paths, infos):
+        found = mismatches(info)
+        if not found:
+            continue
+        if found.get("video") == ["missing"]:
+            print(f"[ERROR] {path.name}: no video stream")
+            failed += 1
+            continue
+        print(f"[INFO] {path.name}: {', '.join(f for fields in found.values() for f in fields)}")
+        jobs[path] = "video" in found
+
+    # Parameter sets each segment will end up with; conforming always re-encodes the audio
+    own = {path: parameter_sets(info) for path, info in zip(paths, infos) if "video" in info}
+    reference = None
+    while True:
+        if reference is None and (jobs or len({json.dumps(sets) for sets in own.values()}) > 1):
+            try:
+                reference = reference_parameter_sets(ffmpeg)
+            except RuntimeError as e:
+                print(f"[ERROR] {e}")
+                return failed + max(1, len(jobs))
+        final = {path: {"video": reference["video"] if jobs.get(path) else sets["video"],
+                        "audio": reference["audio"] if path in jobs else sets["audio"]}
+                 for path, sets in own.items()}
+        added = False
+        for kind in CANONICAL:
+            if len({sets[kind] for sets in final.values()}) < 2:
+                continue
+            for path, sets in final.items():
+                if sets[kind] != reference[kind]:
+                    print(f"[INFO] {path.name}: {kind} parameter sets differ from the other segments")
+                    jobs[path] = jobs.get(path, False) or kind == "video"
+                    added = True
+        if not added:
+            break
+
+    print(f"[INFO] {len(jobs)}/{len(paths)} segments need conforming")
+    if dry_run or not jobs:
+        return failed
+
+    workers = encode_workers(len(jobs), workers)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    def run(job):
+        path, video = job
+        start = time.time()
+        if not conform_segment(path, video, ffmpeg, threads):
+            return False
+        print(f"[INFO] Conformed {path.name} ({'video+audio' if video else 'audio'}) in {time.time() - start:.1f}s")
+        sets = parameter_sets(probe_segment(path, ffmpeg))
+        if sets["audio"] != reference["audio"] or (video and sets["video"] != reference["video"]):
+            print(f"[ERROR] {path.name}: parameter sets still differ after conforming")
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        failed += sum(1 for ok in pool.map(run, jobs.items()) if not ok)
+    return failed
+
+
+def verify_decode(path, ffmpeg="ffmpeg"):
+    """Decode `path` end to end; False (with ffmpeg's complaints printed) on any decode error."""
+    result = subprocess.run([ffmpeg, "-v", "error", "-i", str(path), "-f", "null", "-"],
+                            capture_output=True, text=True)
+    if result.returncode != 0 or result.stderr.strip():
+        print(f"[ERROR] {Path(path).name} does not decode cleanly: {result.stderr.strip()[-500:]}")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conform avatar segments to the canonical profile")
+    parser.add_argument("segment_dir", help="Directory of segment .mp4 files")
+    parser.add_argument("--jobs", type=int, help="Concurrent encodes (default: cores, capped by memory)")
+    parser.add_argument("--ffmpeg", default="ffmpeg")
+    parser.add_argument("--dry-run", action="store_true", help="Only report mismatches")
+    args = parser.parse_args()
+
+    paths = sorted(p for p in Path(args.segment_dir).glob("*.mp4") if not p.name.endswith(".conform.mp4"))
+    if not paths:
+        print("[ERROR] No segments found")
+        sys.exit(1)
+    sys.exit(1 if normalize_segments(paths, args.jobs, args.ffmpeg, args.dry_run) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Small asyncio DAG runner for the daily video pipeline.
+
+Each node has a kind (tts, render, normalize, output, ...) and starts as
+soon as its dependencies are done, subject to a per-kind concurrency limit.
+A failed node blocks only its descendants; independent branches (other
+segments) keep going. Node outcomes are written to a JSON state file as
+they happen, so a re-run skips finished nodes and resumes at the failed ones.
+A node recorded as done still runs again if one of its output files has
+gone missing or one of its dependencies ran again. The state is dropped
+when the run's fingerprint (e.g. the script) changes.
+
+Usage:
+    python segment_dag.py output/daily/YYYY-MM-DD/dag_state.json    # show a run's state
+"""
+
+import asyncio
+import contextlib
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+class SegmentDag:
+    """Dependency-ordered async jobs with per-kind limits and a resumable state file."""
+
+    def __init__(self, state_path, limits: dict, fingerprint: str = ""):
+        self.state_path = Path(state_path)
+        self.limits = limits
+        self.fingerprint = fingerprint
+        self.nodes = {}
+        self.state = {"fingerprint": fingerprint, "nodes": {}}
+        if self.state_path.exists():
+            with open(self.state_path) as f:
+                saved = json.load(f)
+            if saved.get("fingerprint") == fingerprint:
+                self.state = saved
+            else:
+                print("[INFO] Inputs changed since the last run; starting the DAG fresh")
+
+    def add(self, name: str, kind: str, fn, deps=(), outputs=()):
+        """
+        Add a node. fn is an async callable returning True on success; outputs
+        are the files it produces, checked before trusting a "done" from a previous run.
+        """
+        missing = [d for d in deps if d not in self.nodes]
+        if missing:
+            raise ValueError(f"{name}: unknown dependencies {missing}")
+        self.nodes[name] = {"kind": kind, "fn": fn, "deps": list(deps), "outputs": [Path(p) for p in outputs]}
+
+    def _reusable(self, name, reran) -> bool:
+        """Whether a node can be skipped: done before, outputs still there, inputs unchanged this run."""
+        node = self.nodes[name]
+        if self.state["nodes"].get(name, {}).get("status") != "done":
+            return False
+        gone = [p.name for p in node["outputs"] if not p.exists()]
+        if gone:
+            print(f"[INFO] {name}: done in a previous run but {', '.join(gone)} is missing; running again")
+            return False
+        return not any(dep in reran for dep in node["deps"])
+
+    def _save(self):
+        temp = self.state_path.with_suffix(".tmp")
+        with open(temp, "w") as f:
+            json.dump(self.state, f, indent=2)
+        temp.replace(self.state_path)
+
+    def _record(self, name, status, seconds=0.0, error=None):
+        entry = {"kind": self.nodes[name]["kind"], "status": status, "seconds": round(seconds, 2),
+                 "finished": datetime.now().isoformat(timespec="seconds")}
+        if error:
+            entry["error"] = error
+        self.state["nodes"][name] = entry
+        self._save()
+
+    async def run(self) -> bool:
+        """Run every node not already done. True if the whole graph completed."""
+        slots = {kind: asyncio.Semaphore(max(1, n)) for kind, n in self.limits.items()}
+        finished = {name: asyncio.get_running_loop().create_future() for name in self.nodes}
+        reran = set()
+        self._started = time.perf_counter()
+
+        async def execute(name):
+            node = self.nodes[name]
+            ok = True
+            for dep in node["deps"]:
+                ok = await finished[dep] and ok
+            if not ok:
+                self._record(name, "blocked")
+                return False
+            if self._reusable(name, reran):
+                print(f"[SKIP] {name}: done in a previous run")
+                return True
+            reran.add(name)
+            async with slots.get(node["kind"]) or contextlib.nullcontext():
+                start = time.perf_counter()
+                print(f"[INFO] {name}: started at +{start - self._started:.1f}s")
+                try:
+                    ok = bool(await node["fn"]())
+                    error = None if ok else "returned failure"
+                except Exception as e:
+                    ok, error = False, f"{type(e).__name__}: {e}"
+                elapsed = time.perf_counter() - start
+            self._record(name, "done" if ok else "failed", elapsed, error)
+            print(f"[{'INFO' if ok else 'ERROR'}] {name}: {'done' if ok else 'failed'} in {elapsed:.1f}s"
+                  + (f" ({error})" if error else ""))
+            return ok
+
+        async def settle(name):
+            finished[name].set_result(await execute(name))
+
+        await asyncio.gather(*(settle(name) for name in self.nodes))
+        self.state["wall_seconds"] = round(time.perf_counter() - self._started, 2)
+        self._save()
+        return all(f.result() for f in finished.values())
+
+    def summary(self) -> str:
+        """Wall time against per-kind busy time, the longest dependency chain and the busiest stage."""
+        nodes = self.state["nodes"]
+        totals = {}
+        for entry in nodes.values():
+            totals[entry["kind"]] = totals.get(entry["kind"], 0.0) + entry.get("seconds", 0.0)
+        path = {}
+        for name, node in self.nodes.items():  # insertion order is topological
+            path[name] = nodes.get(name, {}).get("seconds", 0.0) + max((path[d] for d in node["deps"]), default=0.0)
+        failed = [n for n, e in nodes.items() if e["status"] in ("failed", "blocked")]
+        lines = [f"  {kind:<10} {seconds:7.1f}s summed" for kind, seconds in totals.items()]
+        lines.append(f"  serial     {sum(totals.values()):7.1f}s one node at a time")
+        lines.append(f"  critical   {max(path.values(), default=0.0):7.1f}s longest dependency chain")
+        # A kind capped at n in flight can't finish faster than its summed time / n
+        bound = max((seconds / max(1, self.limits.get(kind, len(self.nodes))) for kind, seconds in totals.items()),
+                    default=0.0)
+        lines.append(f"  capacity   {bound:7.1f}s busiest stage at its concurrency limit")
+        lines.append(f"  wall       {self.state.get('wall_seconds', 0.0):7.1f}s")
+        if failed:
+            lines.append(f"  not done   {', '.join(failed)} (re-run to resume)")
+        return "\n".join(lines)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python segment_dag.py path/to/dag_state.json")
+        sys.exit(1)
+    with open(sys.argv[1]) as f:
+        state = json.load(f)
+    for name, entry in state["nodes"].items():
+        print(f"  {entry['status']:<8} {name:<28} {entry.get('seconds', 0):7.1f}s  {entry.get('error', '')}")
+    print(f"  wall {state.get('wall_seconds', 0):.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Size-targeted Telegram encode settings.
+
+Telegram rejects bot uploads over 50 MB. A fixed CRF can't promise that for
+long episodes, so the 720p encode keeps CRF 26 for quality but adds a VBV cap
+computed from the probed duration and the audio bitrate: short videos come out
+as small as before, long ones are held under the byte budget on the first
+encode. check_size() verifies the result.
+
+Usage:
+    python telegram_budget.py input.mp4 [--budget-mb 48]    # print the bitrate plan
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+TELEGRAM_LIMIT = 50 * 1024 * 1024
+# Headroom under the hard limit for rate-control error
+DEFAULT_BUDGET = int(float(os.environ.get("TELEGRAM_BUDGET_MB", "48")) * 1024 * 1024)
+AUDIO_BITRATE = 128_000
+# MP4 headers, sample tables and AAC framing
+MUXING_OVERHEAD = 0.02
+# Seconds of VBV buffer; can be full on top of maxrate * duration
+BUFFER_SECONDS = 1.0
+MIN_VIDEO_BITRATE = 150_000
+
+
+def ffprobe_for(ffmpeg: str) -> str:
+    """ffprobe next to the given ffmpeg ("ffmpeg" -> "ffprobe", ...\\ffmpeg.exe -> ...\\ffprobe.exe)."""
+    head, tail = os.path.split(ffmpeg)
+    return os.path.join(head, tail.replace("ffmpeg", "ffprobe"))
+
+
+def probe_duration(path: str, ffmpeg: str = "ffmpeg") -> float:
+    """Container duration in seconds."""
+    result = subprocess.run(
+        [ffprobe_for(ffmpeg), "-v", "quiet", "-show_entries", "format=duration", "-of", "csv=p=0", str(path)],
+        capture_output=True, text=True
+    )
+    return float(result.stdout.strip())
+
+
+def video_bitrate(duration: float, budget: int = DEFAULT_BUDGET, audio_bitrate: int = AUDIO_BITRATE) -> int:
+    """Largest video bitrate (bits/s) whose worst case still fits the budget."""
+    usable = budget * 8 * (1 - MUXING_OVERHEAD) - audio_bitrate * duration
+    return max(MIN_VIDEO_BITRATE, int(usable / (duration + BUFFER_SECONDS)))
+
+
+def telegram_video_args(duration: float, budget: int = DEFAULT_BUDGET, audio_bitrate: int = AUDIO_BITRATE) -> list:
+    """x264 + AAC args for the Telegram rendition: CRF 26, capped to fit `budget` bytes."""
+    rate = video_bitrate(duration, budget, audio_bitrate)
+    return [
+        "-c:v", "libx264", "-crf", "26",
+        "-maxrate", str(rate), "-bufsize", str(int(rate * BUFFER_SECONDS)),
+        "-c:a", "aac", "-b:a", str(audio_bitrate),
+    ]
+
+
+def check_size(path: str, budget: int = DEFAULT_BUDGET) -> int:
+    """Report the encoded size against the budget; returns the size in bytes."""
+    size = os.path.getsize(path)
+    status = "INFO" if size <= budget else "WARN"
+    print(f"[{status}] Telegram file: {size / (1024 * 1024):.1f} MB of {budget / (1024 * 1024):.1f} MB budget")
+    return size
+
+
+def retry_budget(budget: int, target: int, size: int) -> int:
+    """Target for a corrective encode after an overshoot, scaled by how far off the first one was."""
+    return int(target * budget / size * 0.97)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan a size-targeted Telegram encode")
+    parser.add_argument("input")
+    parser.add_argument("--budget-mb", type=float, default=DEFAULT_BUDGET / (1024 * 1024))
+    parser.add_argument("--ffmpeg", default="ffmpeg")
+    args = parser.parse_args()
+
+    budget = int(args.budget_mb * 1024 * 1024)
+    duration = probe_duration(args.input, args.ffmpeg)
+    rate = video_bitrate(duration, budget)
+    worst = (rate * (duration + BUFFER_SECONDS) + AUDIO_BITRATE * duration) / 8 / (1 - MUXING_OVERHEAD)
+    print(f"duration {duration:.1f}s, video cap {rate / 1000:.0f} kbps, audio {AUDIO_BITRATE // 1000} kbps, "
+          f"worst case {worst / (1024 * 1024):.1f} MB of {args.budget_mb:g} MB")
+    if rate == MIN_VIDEO_BITRATE:
+        print("[WARN] Too long for this budget at a watchable bitrate", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
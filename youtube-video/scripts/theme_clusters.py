@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Local theme clustering over digest history.
+
+Builds TF-IDF vectors from video titles (weighted up) and the opening of
+any cached transcript, clusters them with spherical k-means, merges clusters
+whose centroids are close (k is picked generously, so one big story tends
+to split) and ranks clusters by how many distinct channels cover them,
+scaled by how tight the cluster is. Each theme comes out in the {name, description, videos} shape
+generate_daily_video.py expects, with its most representative videos.
+
+A week of history (thousands of videos) clusters in a few seconds on CPU.
+
+Usage:
+    python theme_clusters.py [--hours 24] [--top 2] [--k N] [--min-sources 2] [--no-transcripts]
+
+Requirements:
+    pip install numpy
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    if __name__ == "__main__":
+        print("ERROR: numpy not installed. Run: pip install numpy", file=sys.stderr)
+        sys.exit(1)
+    # Importers decide whether clustering is optional for them
+    raise ImportError("numpy not installed. Run: pip install numpy") from e
+
+SKILLS_DIR = Path(__file__).resolve().parents[2]
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:['.+-][a-z0-9]+)*")
+STOPWORDS = frozenset("""
+a about after again all also am an and any are as at be because been before being
+best but by can could day did do does don't for from get got has have here how i
+if in into is it it's its just let's like make more most my new no not now of on
+one only or other our out over really so some such than that that's the their them
+then there these they thing things this to too up us very video vs want was watch
+way we were what when which while who why will with would you your
+""".split())
+TITLE_WEIGHT = 3
+TRANSCRIPT_WORDS = 400
+MAX_FEATURES = 4096
+MAX_ITER = 30
+# Centroid cosine above which two clusters are taken to be the same story
+MERGE_SIMILARITY = 0.35
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and not t.isdigit()]
+
+
+def document_terms(video: dict, transcript: Optional[str]) -> Counter:
+    """Term counts for one video: title unigrams and bigrams (weighted) and the transcript lead."""
+    title = tokenize(video.get("title") or "")
+    terms = Counter()
+    for term in title + [f"{a} {b}" for a, b in zip(title, title[1:])]:
+        terms[term] += TITLE_WEIGHT
+    if transcript:
+        terms.update(tokenize(" ".join(transcript.split()[:TRANSCRIPT_WORDS])))
+    return terms
+
+
+def tfidf(docs: list[Counter], max_features: int = MAX_FEATURES) -> tuple[np.ndarray, list[str]]:
+    """
+    Row-normalised sublinear TF-IDF over the max_features most widespread terms.
+    Terms in one document only or in over half of them carry no theme signal and are dropped.
+    """
+    df = Counter()
+    for doc in docs:
+        df.update(doc.keys())
+    limit = max(2, len(docs) // 2)
+    vocab = [t for t, n in df.most_common() if 2 <= n <= limit][:max_features]
+    column = {t: i for i, t in enumerate(vocab)}
+
+    rows, cols, counts = [], [], []
+    for i, doc in enumerate(docs):
+        for term, count in doc.items():
+            j = column.get(term)
+            if j is not None:
+                rows.append(i)
+                cols.append(j)
+                counts.append(count)
+
+    matrix = np.zeros((len(docs), max(len(vocab), 1)), dtype=np.float32)
+    if not vocab:
+        return matrix, vocab
+    matrix[rows, cols] = 1.0 + np.log(np.asarray(counts, dtype=np.float32))
+    idf = np.log((1 + len(docs)) / (1 + np.asarray([df[t] for t in vocab], dtype=np.float32))) + 1.0
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms, vocab
+
+
+def spherical_kmeans(x: np.ndarray, k: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Cosine k-means with k-means++ seeding. Returns (labels, unit centroids)."""
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    centroids = np.empty((k, x.shape[1]), dtype=np.float32)
+    centroids[0] = x[rng.integers(n)]
+    closest = 1.0 - x @ centroids[0]
+    for c in range(1, k):
+        weights = np.clip(closest, 0, None) ** 2
+        total = weights.sum()
+        pick = rng.choice(n, p=weights / total) if total > 0 else rng.integers(n)
+        centroids[c] = x[pick]
+        closest = np.minimum(closest, 1.0 - x @ centroids[c])
+
+    labels = np.full(n, -1)
+    for _ in range(MAX_ITER):
+        sims = x @ centroids.T
+        new_labels = sims.argmax(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for c in range(k):
+            members = x[labels == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+            else:
+                # Re-seed an empty cluster with the worst-fitting video
+                centroids[c] = x[sims.max(axis=1).argmin()]
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids /= norms
+    return labels, centroids
+
+
+def merge_clusters(x: np.ndarray, labels: np.ndarray, centroids: np.ndarray,
+                   threshold: float = MERGE_SIMILARITY) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Repeatedly merge the two most similar non-empty clusters while their centroid
+    cosine exceeds threshold. Returns relabelled (labels, unit centroids), one per cluster left.
+    """
+    groups = [np.flatnonzero(labels == c) for c in range(len(centroids))]
+    groups = [g for g in groups if len(g)]
+
+    def centroid(members):
+        total = x[members].sum(axis=0)
+        norm = np.linalg.norm(total)
+        return total / norm if norm else total
+
+    cents = np.stack([centroid(g) for g in groups])
+    while len(groups) > 1:
+        sims = cents @ cents.T
+        np.fill_diagonal(sims, -1.0)
+        a, b = np.unravel_index(sims.argmax(), sims.shape)
+        if sims[a, b] <= threshold:
+            break
+        groups[a] = np.concatenate([groups[a], groups[b]])
+        cents[a] = centroid(groups[a])
+        del groups[b]
+        cents = np.delete(cents, b, axis=0)
+
+    merged = np.empty(len(labels), dtype=int)
+    for c, members in enumerate(groups):
+        merged[members] = c
+    return merged, cents.astype(np.float32)
+
+
+def _theme_name(keywords: list[str]) -> str:
+    """Prefer bigrams; skip unigrams already covered by a chosen bigram."""
+    chosen, covered = [], set()
+    for term in sorted(keywords, key=lambda t: " " not in t):
+        words = set(term.split())
+        if words <= covered:
+            continue
+        chosen.append(term)
+        covered |= words
+        if len(chosen) == 2:
+            break
+    return " & ".join(t.title() for t in chosen)
+
+
+def cluster_themes(videos: list[dict], top: int = 2, k: Optional[int] = None, min_sources: int = 2,
+                   per_theme: int = 5, transcripts: Optional[dict] = None) -> list[dict]:
+    """
+    Cluster videos ({videoId, title, channel}) into ranked themes.
+    `transcripts` maps videoId to transcript text. Themes covered by fewer than
+    min_sources channels are dropped.
+    """
+    videos = list({v["videoId"]: v for v in videos if v.get("videoId")}.values())
+    if len(videos) < 2:
+        return []
+    transcripts = transcripts or {}
+    x, vocab = tfidf([document_terms(v, transcripts.get(v["videoId"])) for v in videos])
+    # Videos sharing no terms with any other can't join a theme
+    keep = np.flatnonzero(x.any(axis=1))
+    if len(keep) < 2:
+        return []
+    videos = [videos[i] for i in keep]
+    x = x[keep]
+
+    k = k or int(np.clip(round(np.sqrt(len(videos) / 2)), 2, 40))
+    labels, centroids = spherical_kmeans(x, min(k, len(videos)))
+    labels, centroids = merge_clusters(x, labels, centroids)
+    sims = np.einsum("ij,ij->i", x, centroids[labels])
+
+    themes = []
+    for c in range(len(centroids)):
+        members = np.flatnonzero(labels == c)
+        channels = {videos[i].get("channel") for i in members}
+        if len(channels) < min_sources:
+            continue
+        cohesion = float(sims[members].mean())
+        keywords = [vocab[j] for j in np.argsort(centroids[c])[::-1][:6] if centroids[c][j] > 0]
+
+        # Closest videos first, one per channel before any repeats
+        ranked = members[np.argsort(-sims[members])]
+        picked, seen = [], set()
+        for i in list(ranked) + list(ranked):
+            if len(picked) == per_theme:
+                break
+            channel = videos[i].get("channel")
+            if i in picked or (channel in seen and len(seen) < len(channels)):
+                continue
+            picked.append(i)
+            seen.add(channel)
+
+        themes.append({
+            "name": _theme_name(keywords) or "Misc",
+            "description": f"{len(members)} videos from {len(channels)} channels on {', '.join(keywords[:4])}",
+            "videos": [
+                {"videoId": videos[i]["videoId"], "title": videos[i].get("title"), "channel": videos[i].get("channel")}
+                for i in picked
+            ],
+            "keywords": keywords,
+            "size": int(len(members)),
+            "sources": len(channels),
+            "score": round(len(channels) * cohesion, 3),
+        })
+
+    themes.sort(key=lambda t: t["score"], reverse=True)
+    return themes[:top]
+
+
+def load_transcripts(video_ids: list[str]) -> dict:
+    """Transcript text for videos already in the youtube-summarize cache (no fetching)."""
+    sys.path.insert(0, str(SKILLS_DIR / "youtube-summarize" / "scripts"))
+    from transcript_cache import DEFAULT_CACHE_DIR, TranscriptCache
+
+    if not (DEFAULT_CACHE_DIR / "transcripts.db").exists():
+        return {}
+    hits = TranscriptCache().peek_many(video_ids)
+    return {video_id: " ".join(seg[2] for seg in segments) for video_id, segments in hits.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster digest history into ranked themes")
+    parser.add_argument("--hours", type=float, default=24, help="History window")
+    parser.add_argument("--top", type=int, default=2, help="Themes to return")
+    parser.add_argument("--k", type=int, help="Cluster count (default ~sqrt(n/2))")
+    parser.add_argument("--min-sources", type=int, default=2, help="Minimum channels per theme")
+    parser.add_argument("--no-transcripts", action="store_true", help="Ignore cached transcripts")
+    parser.add_argument("--data-dir", default="~/.openclaw/workspace/data", help="Workspace data directory")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(SKILLS_DIR / "youtube-digest" / "scripts"))
+    from digest_history import DigestHistory
+
+    since = datetime.now(timezone.utc) - timedelta(hours=args.hours)
+    videos = list(DigestHistory(Path(os.path.expanduser(args.data_dir))).rows(since))
+    start = time.time()
+    transcripts = {} if args.no_transcripts else load_transcripts([v["videoId"] for v in videos])
+    themes = cluster_themes(videos, args.top, args.k, args.min_sources, transcripts=transcripts)
+    print(f"[INFO] {len(videos)} videos ({len(transcripts)} with transcripts) -> {len(themes)} themes "
+          f"in {time.time() - start:.2f}s", file=sys.stderr)
+    print(json.dumps(themes, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
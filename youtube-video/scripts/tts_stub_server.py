@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the ElevenLabs text-to-speech endpoint.
+
+Answers POST /v1/text-to-speech/{voice_id} with silent MP3 audio as long as
+the text would take to read. It takes a configurable time per character,
+fails a share of requests with 429/500, and returns 429 past a
+concurrent-request limit, like the real plan limits. Point the pipeline at it to
+exercise TTS concurrency and retries without an API key or credits:
+
+    python tts_stub_server.py --port 8799 --fail-rate 0.2 &
+    ELEVENLABS_BASE_URL=http://127.0.0.1:8799 ELEVENLABS_API_KEY=stub \\
+        python generate_daily_video.py --script-json script.json --skip-heygen
+
+Usage:
+    python tts_stub_server.py [--port 8799] [--seconds-per-char 0.01] [--fail-rate 0] [--max-concurrent 5]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Silent MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, joint stereo, 1152 samples
+MP3_FRAME = bytes.fromhex("fffb9064") + bytes(413)
+FRAME_SECONDS = 1152 / 44100
+# Roughly how fast the voice reads
+CHARS_PER_SECOND = 15
+
+
+class StubState:
+    def __init__(self, seconds_per_char, fail_rate, max_concurrent):
+        self.seconds_per_char = seconds_per_char
+        self.fail_rate = fail_rate
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.peak = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+class TTSHandler(BaseHTTPRequestHandler):
+    state: StubState = None
+
+    def _reply(self, status, body=b"", content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # Counters for checking a run: total requests and peak concurrency
+        state = self.state
+        with state.lock:
+            stats = {"requests": state.requests, "in_flight": state.in_flight, "peak": state.peak}
+        self._reply(200, json.dumps(stats).encode())
+
+    def do_POST(self):
+        state = self.state
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.startswith("/v1/text-to-speech/") or not payload.get("text"):
+            self._reply(400, b'{"detail": "bad request"}')
+            return
+        if not self.headers.get("xi-api-key"):
+            self._reply(401, b'{"detail": "missing api key"}')
+            return
+
+        with state.lock:
+            state.requests += 1
+            busy = state.in_flight >= state.max_concurrent
+            if not busy:
+                state.in_flight += 1
+                state.peak = max(state.peak, state.in_flight)
+        if busy:
+            self._reply(429, b'{"detail": "too_many_concurrent_requests"}', headers={"Retry-After": "1"})
+            return
+
+        try:
+            text = payload["text"]
+            time.sleep(len(text) * state.seconds_per_char)
+            if random.random() < state.fail_rate:
+                status = random.choice((429, 500))
+                self._reply(status, json.dumps({"detail": f"stub failure {status}"}).encode())
+                return
+            frames = max(1, int(len(text) / CHARS_PER_SECOND / FRAME_SECONDS))
+            self._reply(200, MP3_FRAME * frames, "audio/mpeg")
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+
+    def log_message(self, fmt, *args):
+        print(f"[INFO] {self.address_string()} {fmt % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub ElevenLabs TTS server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--seconds-per-char", type=float, default=0.01, help="Simulated synthesis time")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered 429/500")
+    parser.add_argument("--max-concurrent", type=int, default=5, help="Concurrent requests before 429")
+    parser.add_argument("--seed", type=int, help="Seed the failure pattern")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    TTSHandler.state = StubState(args.seconds_per_char, args.fail_rate, args.max_concurrent)
+    server = ThreadingHTTPServer((args.host, args.port), TTSHandler)
+    print(f"[INFO] Stub TTS on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()